@@ -6,7 +6,7 @@
  *   Motor Left  (A): IN1..IN4 → 8, 9, 10, 11
  *   Motor Right (B): IN1..IN4 → 4, 5, 6, 7
  *
- * Controls (Serial Monitor @ 9600 baud):
+ * Controls (Serial Monitor @ 115200 baud):
  *   W = forward        S = reverse
  *   A = pivot left     D = pivot right
  *   X or ' ' (space) = stop
@@ -148,12 +148,13 @@ void printHelp() {
 // ---------- Arduino ----------
 void setup() {
   setupWheels();
-  Serial.begin(9600);
+  Serial.begin(115200);
   pinsModeOut(left.pins);
   pinsModeOut(right.pins);
   coilsOff(left.pins);
   coilsOff(right.pins);
   printHelp();
+  Serial.println("READY");  // host waits for this instead of a fixed reset delay
 }
 
 void loop() {
@@ -193,6 +194,9 @@ void loop() {
       case '5': baseSPS = 1200; Serial.println("Preset 5 -> 1200 sps"); break;
 
       case 'h': case 'H': printHelp(); break;
+
+      // identity query for host-side sketch detection
+      case '?': Serial.println("SKETCH=WASD_DUAL;VER=1"); break;
       default: /* ignore */ break;
     }
   }
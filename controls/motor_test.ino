@@ -4,7 +4,7 @@
  */
 
 void setup() {
-  Serial.begin(9600);
+  Serial.begin(115200);
   
   // Set all motor pins as outputs
   for(int i = 4; i <= 11; i++) {
@@ -14,6 +14,7 @@ void setup() {
   
   Serial.println("Motor test ready");
   Serial.println("Commands: l=left motor, r=right motor, p#=test pin #");
+  Serial.println("READY");  // host waits for this instead of a fixed reset delay
 }
 
 void loop() {
@@ -49,7 +49,7 @@ const int stepSequence[8][4] = {
 };
 
 void setup() {
-  Serial.begin(9600);
+  Serial.begin(115200);
   
   // Initialize stepper motor pins
   pinMode(IN1_PIN, OUTPUT);
@@ -79,6 +79,7 @@ void setup() {
   Serial.println("  'p' - Set custom position");
   
   printStatus();
+  Serial.println("READY");  // host waits for this instead of a fixed reset delay
 }
 
 void loop() {
@@ -163,6 +164,11 @@ void handleCommand(char command) {
       setCustomPosition();
       break;
       
+    case '?':
+      // Identity query for host-side sketch detection
+      Serial.println("SKETCH=SINGLE_STEPPER;VER=1");
+      break;
+      
     default:
       Serial.println("Unknown command. Use f/b/s/+/-/1/2/3/4/r/c/h/t/i/p");
       break;
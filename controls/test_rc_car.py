@@ -10,21 +10,19 @@ import serial
 import sys
 import time
 import glob
+import functools
+import selectors
+from serial.tools import list_ports
 
+@functools.lru_cache(maxsize=1)
 def find_arduino_ports():
     """Find available Arduino ports"""
     ports = []
     
     # Windows
     if sys.platform.startswith('win'):
-        for i in range(256):
-            try:
-                port = f'COM{i}'
-                ser = serial.Serial(port, timeout=0.1)
-                ser.close()
-                ports.append(port)
-            except (OSError, serial.SerialException):
-                pass
+        # Enumerate COM ports in one registry query instead of opening COM0-255
+        ports.extend(p.device for p in list_ports.comports())
     # Linux/Mac
     else:
         port_patterns = ['/dev/ttyACM*', '/dev/ttyUSB*', '/dev/tty.usbmodem*', '/dev/tty.usbserial*']
@@ -33,6 +31,25 @@ def find_arduino_ports():
     
     return sorted(ports)
 
+def read_response_lines(ser, window):
+    """Yield decoded reply lines until the Arduino goes quiet or `window` seconds pass
+    
+    The deadline matters: once its watchdog fires, the RC sketch prints on
+    every loop(), so waiting for silence alone would never return.
+    """
+    deadline = time.monotonic() + window
+    while True:
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            break
+        ser.timeout = remaining
+        raw = ser.readline()
+        if not raw:
+            break
+        line = raw.decode('utf-8', errors='ignore').strip()
+        if line:
+            yield line
+
 def send_command(port, steer, throttle):
     """Send a single command to Arduino"""
     ser = None
@@ -50,8 +67,9 @@ def send_command(port, steer, throttle):
         time.sleep(2.5)  # Give Arduino time to reset and initialize
         
         # Clear any startup messages
-        if ser.in_waiting > 0:
-            startup = ser.read(ser.in_waiting).decode('utf-8', errors='ignore')
+        waiting = ser.in_waiting
+        if waiting:
+            startup = ser.read(waiting).decode('utf-8', errors='ignore')
             print(f"Arduino startup: {startup.strip()}")
         
         print(f"Sending: {command.strip()}")
@@ -62,19 +80,13 @@ def send_command(port, steer, throttle):
         ser.flush()  # Ensure data is sent immediately
         print(f"✓ Wrote {bytes_written} bytes")
         
-        # Read response with timeout
+        # Read response lines as they arrive, for up to 1 second
         print("Waiting for Arduino response...")
-        time.sleep(0.2)
         
         response_lines = []
-        start_time = time.time()
-        while time.time() - start_time < 1.0:  # Wait up to 1 second for response
-            if ser.in_waiting > 0:
-                line = ser.readline().decode('utf-8', errors='ignore').strip()
-                if line:
-                    response_lines.append(line)
-                    print(f"Arduino: {line}")
-            time.sleep(0.05)
+        for line in read_response_lines(ser, 1.0):
+            response_lines.append(line)
+            print(f"Arduino: {line}")
         
         if not response_lines:
             print("⚠ No response from Arduino")
@@ -121,14 +133,22 @@ def interactive_mode(port):
     ser = None
     try:
         print("Connecting... (Arduino will reset - this is normal)")
-        ser = serial.Serial(port=port, baudrate=115200, timeout=1)
+        ser = serial.Serial(port=port, baudrate=115200, timeout=0.5)
         time.sleep(2.5)  # Wait for Arduino reset
         
         # Clear startup messages
-        if ser.in_waiting > 0:
-            startup = ser.read(ser.in_waiting).decode('utf-8', errors='ignore')
+        waiting = ser.in_waiting
+        if waiting:
+            startup = ser.read(waiting).decode('utf-8', errors='ignore')
             print(f"Arduino: {startup.strip()}")
         
+        # Wake as soon as the Arduino replies instead of waiting out the read
+        # timeout after every command (Windows ports have no selectable fd)
+        sel = None
+        if not sys.platform.startswith('win'):
+            sel = selectors.DefaultSelector()
+            sel.register(ser.fileno(), selectors.EVENT_READ)
+        
         print("Ready! Enter commands:\n")
         
         while True:
@@ -149,17 +169,30 @@ def interactive_mode(port):
             ser.write(f"{cmd}\n".encode())
             ser.flush()
             
-            # Read response
-            time.sleep(0.2)
-            response_lines = []
-            start_time = time.time()
-            while time.time() - start_time < 0.5:
-                if ser.in_waiting > 0:
-                    line = ser.readline().decode('utf-8', errors='ignore').strip()
-                    if line:
-                        response_lines.append(line)
-                        print(f"Arduino: {line}")
-                time.sleep(0.05)
+            # Read response until the Arduino goes quiet
+            if sel is None:
+                for line in read_response_lines(ser, 0.5):
+                    print(f"Arduino: {line}")
+                continue
+            
+            # Stop after 0.5s even if output keeps coming (the sketch's
+            # watchdog prints on every loop once it fires)
+            data = b''
+            events = sel.select(timeout=1.0)
+            deadline = time.monotonic() + 0.5
+            while events:
+                waiting = ser.in_waiting
+                if not waiting:
+                    break  # Readable with nothing to read: port went away
+                data += ser.read(waiting)
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                events = sel.select(timeout=min(0.05, remaining))
+            for raw in data.splitlines():
+                line = raw.decode('utf-8', errors='ignore').strip()
+                if line:
+                    print(f"Arduino: {line}")
         
         ser.close()
         print("Stopped.")
@@ -188,8 +221,7 @@ def main():
         print("\nAvailable ports:")
         ports = find_arduino_ports()
         if ports:
-            for port in ports:
-                print(f"  {port}")
+            sys.stdout.write("".join(f"  {port}\n" for port in ports))
         else:
             print("  (No ports found)")
         print("\nNote: Baud rate is 115200")
@@ -5,37 +5,271 @@ Identifies what sketch is currently running on the Arduino
 """
 
 import serial
-import time
 import sys
-import glob
 import os
+import time
+import re
+import functools
+import array
+import asyncio
+import selectors
+import threading
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+try:
+    import serial_asyncio
+except ImportError:
+    serial_asyncio = None
+
+try:
+    import fcntl
+    import termios
+except ImportError:  # Windows
+    fcntl = None
+    termios = None
+
+# Linux serial ioctls, used when pyserial is too old to have set_low_latency_mode()
+TIOCGSERIAL = 0x541E
+TIOCSSERIAL = 0x541F
+ASYNC_LOW_LATENCY = 1 << 13
+
+# Pre-encoded single-character commands so the interactive loop does no encoding work
+CMD_BYTES = {c: (c + "\n").encode() for c in "wasdxqe0123456789+-h"}
+
+@functools.lru_cache(maxsize=128)
+def encode_command(command):
+    """Return the newline-terminated bytes for a command string"""
+    return CMD_BYTES.get(command) or f"{command}\n".encode()
+
+# Common Arduino port prefixes on Linux/Raspberry Pi
+#   ttyACM - most common for Arduino Uno/Nano
+#   ttyUSB - USB-to-serial adapters
+#   ttyAMA - Raspberry Pi UART
+ARDUINO_PORT_PREFIXES = ('ttyACM', 'ttyUSB', 'ttyAMA')
+
+# Speed presets understood by dual_stepper_wasd.ino: keys min..max select
+# presets[key - min] steps/sec, and q/e trim the speed by step
+SpeedProfile = namedtuple('SpeedProfile', ['min', 'max', 'default', 'presets', 'step'])
+SPEED = SpeedProfile(min=1, max=5, default=3, presets=(300, 600, 800, 1000, 1200), step=100)
+SPEED_KEYS = frozenset(str(n) for n in range(SPEED.min, SPEED.max + 1))
+
+# (mtime of /dev, ports found) from the last scan
+_PORT_CACHE = None
 
 def find_arduino_ports():
     """Automatically find Arduino ports on Raspberry Pi"""
-    arduino_ports = []
+    global _PORT_CACHE
     
-    # Common Arduino port patterns on Linux/Raspberry Pi
-    port_patterns = [
-        '/dev/ttyACM*',  # Most common for Arduino Uno/Nano
-        '/dev/ttyUSB*',  # USB-to-serial adapters
-        '/dev/ttyAMA*',  # Raspberry Pi UART
-    ]
+    # /dev only changes when a device is plugged in or removed, so reuse the
+    # last scan until its mtime moves
+    try:
+        mtime = os.stat('/dev').st_mtime_ns
+    except OSError:
+        return []
+    if _PORT_CACHE and _PORT_CACHE[0] == mtime:
+        return list(_PORT_CACHE[1])
     
-    for pattern in port_patterns:
-        ports = glob.glob(pattern)
-        arduino_ports.extend(ports)
+    with os.scandir('/dev') as entries:
+        arduino_ports = sorted(entry.path for entry in entries
+                               if entry.name.startswith(ARDUINO_PORT_PREFIXES))
     
-    # Filter out ports that are likely not Arduino
-    filtered_ports = []
-    for port in arduino_ports:
-        # Skip if it's a Bluetooth or other non-Arduino device
-        if any(skip in port.lower() for skip in ['bluetooth', 'gps', 'modem']):
-            continue
-        filtered_ports.append(port)
+    _PORT_CACHE = (mtime, arduino_ports)
+    return list(arduino_ports)
+
+def set_low_latency(ser):
+    """Turn off the USB-serial latency timer on an open port
+    
+    FTDI/CH340 drivers batch incoming bytes for up to 16ms by default, which
+    dominates a short command/reply round trip. Like MAVROS, we request
+    ASYNC_LOW_LATENCY on the port; drivers that don't support it are left as-is.
+    """
+    try:
+        ser.set_low_latency_mode(True)
+    except AttributeError:
+        # pyserial < 3.4: set the flag ourselves
+        if fcntl is not None:
+            try:
+                buf = array.array('i', [0] * 32)
+                fcntl.ioctl(ser.fileno(), TIOCGSERIAL, buf)
+                buf[4] |= ASYNC_LOW_LATENCY
+                fcntl.ioctl(ser.fileno(), TIOCSSERIAL, buf)
+            except (IOError, OSError):
+                pass
+    except (NotImplementedError, IOError, OSError, ValueError):
+        pass
+
+# Matches Serial.begin() in the sketches. 115200 keeps a short reply to a couple
+# of milliseconds on the wire; 9600 spent ~20ms per line
+DEFAULT_BAUD = 115200
+
+# Printed by the sketches at the end of setup()
+READY_BANNER = b"READY\r\n"
+
+def wait_for_ready(ser, reset_delay=2.0, banner=READY_BANNER):
+    """Wait for the Arduino to come out of its DTR-triggered reset
+    
+    Returns as soon as the sketch prints banner (READY_BANNER by default).
+    Older sketches that don't print it cost the full reset_delay, same as a
+    fixed sleep.
+    
+    Returns:
+        True if the banner was seen
+    """
+    timeout = ser.timeout
+    ser.timeout = reset_delay
+    try:
+        return ser.read_until(banner).endswith(banner)
+    finally:
+        ser.timeout = timeout
+
+def _keep_dtr_on_close(ser):
+    """Stop the port dropping DTR when closed, so the next open doesn't reset the board
+    
+    Returns:
+        True if the port still had HUPCL set, i.e. this open reset the board
+    """
+    try:
+        attrs = termios.tcgetattr(ser.fileno())
+        if not attrs[2] & termios.HUPCL:
+            return False
+        attrs[2] &= ~termios.HUPCL
+        termios.tcsetattr(ser.fileno(), termios.TCSANOW, attrs)
+    except (termios.error, OSError, ValueError):
+        pass
+    return True
+
+def open_serial(port, baud=DEFAULT_BAUD, timeout=1, reset_delay=0, allow_reset=False):
+    """Open a serial port in low-latency mode
+    
+    Asserting DTR on open resets Uno/Nano boards, which then spend ~1.5s in
+    the bootloader. Unless allow_reset is set we try to talk to the sketch
+    that is already running: on Windows DTR/RTS are held low through open(),
+    and on Linux/macOS (where the kernel raises DTR itself) HUPCL is cleared
+    so DTR stays up between runs and only the first open resets the board.
+    
+    Args:
+        reset_delay: Longest time to wait for the sketch to finish booting
+            after a reset
+        allow_reset: Reset the board so it starts from a fresh state
+    """
+    ser = serial.Serial()
+    ser.port = port
+    ser.baudrate = baud
+    ser.timeout = timeout
+    if not allow_reset and termios is None:
+        ser.dtr = False
+        ser.rts = False
+    ser.open()
+    set_low_latency(ser)
+    
+    if allow_reset:
+        # Pulse DTR in case a previous open left it asserted
+        ser.dtr = False
+        ser.dtr = True
+        was_reset = True
+    elif termios is not None:
+        was_reset = _keep_dtr_on_close(ser)
+    else:
+        was_reset = False
+    
+    if was_reset and reset_delay:
+        wait_for_ready(ser, reset_delay)
+    return ser
+
+def as_text(line):
+    """Decode a reply line for display"""
+    return line.decode('utf-8', 'replace')
+
+def drain_lines(ser, timeout=0.05, window=1.0):
+    """Read everything the Arduino sends until it goes quiet and return its non-empty lines as bytes
+    
+    Waits on the port's file descriptor with select() rather than polling
+    in_waiting, so a reply still arriving over the wire isn't cut short and
+    no CPU is spent spinning. Stops after window seconds even if the sketch
+    keeps printing.
+    """
+    data = b''
+    deadline = time.monotonic() + window
+    try:
+        fd = ser.fileno()
+    except (AttributeError, NotImplementedError, ValueError):
+        fd = None  # Windows ports have no selectable descriptor
+    
+    if fd is None:
+        waiting = ser.in_waiting
+        while waiting and time.monotonic() < deadline:
+            data += ser.read(waiting)
+            waiting = ser.in_waiting
+    else:
+        with selectors.DefaultSelector() as sel:
+            sel.register(fd, selectors.EVENT_READ)
+            remaining = window
+            while remaining > 0 and sel.select(min(timeout, remaining)):
+                waiting = ser.in_waiting
+                if not waiting:
+                    break  # Readable with nothing to read: port went away
+                data += ser.read(waiting)
+                remaining = deadline - time.monotonic()
+    
+    lines = (line.strip() for line in data.splitlines())
+    return [line for line in lines if line]
+
+def read_reply(ser, terminator=b'\n', timeout=0.3):
+    """Block until the Arduino sends one terminated reply or the timeout expires"""
+    previous_timeout = ser.timeout
+    ser.timeout = timeout
+    try:
+        return ser.read_until(terminator)
+    finally:
+        ser.timeout = previous_timeout
+
+def read_reply_lines(ser, timeout=0.3, window=2.0):
+    """Yield reply lines until the Arduino is quiet for timeout seconds or window seconds have passed
     
-    return sorted(filtered_ports)
+    Each line restarts the quiet timeout, so the overall window is what stops
+    a board that never stops printing from holding the caller forever.
+    """
+    deadline = time.monotonic() + window
+    while True:
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            return
+        line = read_reply(ser, timeout=min(timeout, remaining))
+        if not line:
+            return
+        yield line
+
+def read_responses(ser, timeout=0.3):
+    """Wait for the first reply line, then collect whatever else has already arrived"""
+    first = read_reply(ser, timeout=timeout).strip()
+    responses = [first] if first else []
+    responses.extend(drain_lines(ser))
+    return responses
 
-def auto_detect_arduino_port():
+def _probe(port, baud_rate=DEFAULT_BAUD):
+    """Return port if an Arduino answers the help command on it, otherwise None"""
+    try:
+        print(f"Testing {port}...")
+        ser = open_serial(port, baud_rate, reset_delay=1)  # Give Arduino time to initialize
+        try:
+            # Send a test command
+            ser.write(CMD_BYTES['h'])  # Help command
+            
+            # Check if we get a response
+            response = read_reply(ser, timeout=0.5).strip()
+            if response:
+                print(f"✓ Arduino responding on {port}: {as_text(response)}")
+                return port
+        finally:
+            ser.close()
+        
+    except Exception as e:
+        print(f"✗ {port}: {e}")
+    
+    return None
+
+def auto_detect_arduino_port(baud_rate=DEFAULT_BAUD):
     """Auto-detect the best Arduino port"""
     ports = find_arduino_ports()
     
@@ -46,30 +280,18 @@ def auto_detect_arduino_port():
     
     print(f"Found Arduino ports: {ports}")
     
-    # Try each port to see which one responds
-    for port in ports:
-        try:
-            print(f"Testing {port}...")
-            ser = serial.Serial(port=port, baudrate=9600, timeout=1)
-            time.sleep(1)  # Give Arduino time to initialize
-            
-            # Send a test command
-            ser.write(b'h\n')  # Help command
-            time.sleep(0.5)
-            
-            # Check if we get a response
-            if ser.in_waiting > 0:
-                response = ser.readline().decode().strip()
-                if response:
-                    print(f"✓ Arduino responding on {port}: {response}")
-                    ser.close()
-                    return port
-            
-            ser.close()
-            
-        except Exception as e:
-            print(f"✗ {port}: {e}")
-            continue
+    # Probe every port at once; each probe spends most of its time waiting on
+    # the Arduino reset, so the whole pass costs about as long as one probe
+    executor = ThreadPoolExecutor(max_workers=len(ports))
+    futures = [executor.submit(_probe, port, baud_rate) for port in ports]
+    try:
+        for future in as_completed(futures):
+            port = future.result()
+            if port:
+                return port
+    finally:
+        # Don't wait for slower probes once we have an answer
+        executor.shutdown(wait=False, cancel_futures=True)
     
     # If no port responded, return the first available one
     if ports:
@@ -78,68 +300,207 @@ def auto_detect_arduino_port():
     
     return None
 
-def detect_arduino_sketch(port=None, baud_rate=9600):
+# Command sets used to identify the running sketch
+# (the probe payload is the newline-terminated commands, sent in one write)
+SKETCHES = {
+    'WASD Dual Stepper': {
+        'payload': b"h\nw\na\ns\nd\nx\n",
+        'expected_responses': (b'WASD Drive', b'FORWARD', b'PIVOT LEFT', b'REVERSE', b'PIVOT RIGHT', b'STOP')
+    },
+    'Single Stepper Control': {
+        'payload': b"i\nf\nb\ns\n1\n2\n3\n",
+        'expected_responses': (b'Stepper Motor Status', b'Rotating', b'STOPPED')
+    },
+    'Dual Motor Control': {
+        'payload': b"w\na\ns\nd\nx\n",
+        'expected_responses': (b'FORWARD', b'LEFT', b'REVERSE', b'RIGHT', b'STOP')
+    }
+}
+
+# Identity query understood by current firmware. The reply is a single line of
+# semicolon-separated KEY=VALUE pairs, e.g. "SKETCH=WASD_DUAL;VER=1"
+INFO_CMD = b"?\n"
+SKETCH_IDS = {
+    'WASD_DUAL': 'WASD Dual Stepper',
+    'SINGLE_STEPPER': 'Single Stepper Control',
+}
+
+def parse_sketch_id(line):
+    """Return the sketch name for an identity reply, or None if it isn't one"""
+    line = line.strip()
+    if not line.startswith(b"SKETCH="):
+        return None
+    fields = dict(field.split(b'=', 1) for field in line.split(b';') if b'=' in field)
+    sketch_id = fields[b'SKETCH'].decode()
+    return SKETCH_IDS.get(sketch_id, sketch_id)
+
+def identify_sketch(ser, timeout=0.2):
+    """Ask the firmware for its identity, returning None on older sketches"""
+    ser.reset_input_buffer()  # Drop the startup banner
+    ser.write(INFO_CMD)
+    for line in read_reply_lines(ser, timeout=timeout, window=1.0):
+        sketch = parse_sketch_id(line)
+        if sketch:
+            return sketch
+    return None
+
+# One compiled alternation per sketch, so each reply line is scanned once in C
+_SKETCH_MATCHERS = {
+    name: re.compile(b'|'.join(map(re.escape, data['expected_responses'])))
+    for name, data in SKETCHES.items()
+}
+
+def _sketch_probe_steps():
+    """Sketch-matching logic shared by the serial and asyncio probes
+    
+    A generator: yields each sketch's probe payload and is sent back the
+    reply lines that payload produced. Sketches are probed most specific
+    first, so the first match wins.
+    
+    Returns:
+        (detected_sketch, responses) as the generator's return value
+    """
+    responses = {}
+    for sketch_name, test_data in SKETCHES.items():
+        print(f"\nTesting {sketch_name}...")
+        replies = yield test_data['payload']
+        
+        sketch_responses = [reply for reply in (raw.strip() for raw in replies) if reply]
+        for response in sketch_responses:
+            print(f"  {as_text(response)}")
+        responses[sketch_name] = sketch_responses
+        
+        if any(map(_SKETCH_MATCHERS[sketch_name].search, sketch_responses)):
+            print(f"  ✓ Likely match: {sketch_name}")
+            return sketch_name, responses
+        print(f"  ✗ No match: {sketch_name}")
+    
+    return None, responses
+
+def _probe_sketches(ser):
+    """Run each sketch's probe sequence and return (detected_sketch, responses)"""
+    steps = _sketch_probe_steps()
+    try:
+        payload = next(steps)
+        while True:
+            # Don't let the previous sketch's output leak into this one's matching
+            ser.reset_input_buffer()
+            
+            # Send the whole probe sequence in one write, then read each reply
+            # as soon as it arrives; stop after 0.3s of silence or 2s in all
+            ser.write(payload)
+            ser.flush()
+            payload = steps.send(list(read_reply_lines(ser)))
+    except StopIteration as done:
+        return done.value
+
+async def _reply_lines_async(reader, timeout=0.2, window=2.0):
+    """Yield reply lines from a StreamReader, as read_reply_lines() does for a serial port"""
+    deadline = time.monotonic() + window
+    while True:
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            return
+        try:
+            yield await asyncio.wait_for(reader.readuntil(b'\n'), timeout=min(timeout, remaining))
+        except (asyncio.TimeoutError, asyncio.IncompleteReadError, asyncio.LimitOverrunError):
+            return
+
+async def _discard_buffered(reader):
+    """Drop what the StreamReader has already buffered
+    
+    reset_input_buffer() only clears the OS side; bytes the transport has
+    already handed to the reader would otherwise leak into the next match.
+    """
+    while True:
+        try:
+            data = await asyncio.wait_for(reader.read(4096), timeout=0.01)
+        except asyncio.TimeoutError:
+            return
+        if not data:
+            return  # EOF
+
+async def detect_arduino_sketch_async(port, baud_rate=DEFAULT_BAUD):
+    """Run the sketch probes over a pyserial-asyncio connection
+    
+    Writes are pipelined and each reply is awaited with a short timeout, so
+    the pass takes as long as the Arduino actually needs to answer.
+    
+    Returns:
+        (detected_sketch, responses), as from the synchronous probe loop
+    """
+    reader, writer = await serial_asyncio.open_serial_connection(url=port, baudrate=baud_rate)
+    set_low_latency(writer.transport.serial)
+    # Detection wants a fresh start, so reset the board as open_serial(allow_reset=True) does
+    writer.transport.serial.dtr = False
+    writer.transport.serial.dtr = True
+    try:
+        # Wait for Arduino to initialize
+        try:
+            await asyncio.wait_for(reader.readuntil(READY_BANNER), timeout=2)
+        except (asyncio.TimeoutError, asyncio.IncompleteReadError, asyncio.LimitOverrunError):
+            pass  # Older sketch without the banner
+        
+        print("✓ Arduino connected!")
+        print("\nDetecting current sketch...")
+        
+        # Current firmware identifies itself in one round trip
+        writer.write(INFO_CMD)
+        await writer.drain()
+        async for line in _reply_lines_async(reader, window=1.0):
+            sketch = parse_sketch_id(line)
+            if sketch:
+                print(f"  Firmware reports: {as_text(line.strip())}")
+                return sketch, {}
+        
+        # Older firmware: fall back to probing each sketch's commands
+        steps = _sketch_probe_steps()
+        try:
+            payload = next(steps)
+            while True:
+                # Don't let the previous sketch's output leak into this one's matching
+                writer.transport.serial.reset_input_buffer()
+                await _discard_buffered(reader)
+                
+                writer.write(payload)
+                await writer.drain()
+                payload = steps.send([line async for line in _reply_lines_async(reader)])
+        except StopIteration as done:
+            return done.value
+    finally:
+        writer.close()
+        await writer.wait_closed()
+
+def detect_arduino_sketch(port=None, baud_rate=DEFAULT_BAUD):
     """Detect what sketch is running on Arduino"""
     # Auto-detect port if not specified
     if port is None:
         print("Auto-detecting Arduino port...")
-        port = auto_detect_arduino_port()
+        port = auto_detect_arduino_port(baud_rate)
         if port is None:
             print("Could not find Arduino port!")
             return None
     
     try:
         print(f"Connecting to Arduino on {port}...")
-        ser = serial.Serial(port=port, baudrate=baud_rate, timeout=1)
-        time.sleep(2)  # Wait for Arduino to initialize
-        
-        print("✓ Arduino connected!")
-        print("\nDetecting current sketch...")
-        
-        # Test different command sets to identify the sketch
-        sketches = {
-            'WASD Dual Stepper': {
-                'commands': ['h', 'w', 'a', 's', 'd', 'x'],
-                'expected_responses': ['WASD Drive', 'FORWARD', 'PIVOT LEFT', 'REVERSE', 'PIVOT RIGHT', 'STOP']
-            },
-            'Single Stepper Control': {
-                'commands': ['i', 'f', 'b', 's', '1', '2', '3'],
-                'expected_responses': ['Stepper Motor Status', 'Rotating', 'STOPPED']
-            },
-            'Dual Motor Control': {
-                'commands': ['w', 'a', 's', 'd', 'x'],
-                'expected_responses': ['FORWARD', 'LEFT', 'REVERSE', 'RIGHT', 'STOP']
-            }
-        }
-        
-        detected_sketch = None
-        responses = {}
-        
-        for sketch_name, test_data in sketches.items():
-            print(f"\nTesting {sketch_name}...")
-            sketch_responses = []
-            
-            for cmd in test_data['commands']:
-                ser.write(f"{cmd}\n".encode())
-                time.sleep(0.3)
-                
-                # Read response
-                while ser.in_waiting > 0:
-                    response = ser.readline().decode().strip()
-                    if response:
-                        sketch_responses.append(response)
-                        print(f"  {cmd}: {response}")
+        if serial_asyncio is not None:
+            detected_sketch, responses = asyncio.run(detect_arduino_sketch_async(port, baud_rate))
+        else:
+            ser = open_serial(port, baud_rate, reset_delay=2, allow_reset=True)  # Wait for Arduino to initialize
             
-            responses[sketch_name] = sketch_responses
+            print("✓ Arduino connected!")
+            print("\nDetecting current sketch...")
             
-            # Check if responses match expected patterns
-            if any(expected in ' '.join(sketch_responses) for expected in test_data['expected_responses']):
-                detected_sketch = sketch_name
-                print(f"  ✓ Likely match: {sketch_name}")
-            else:
-                print(f"  ✗ No match: {sketch_name}")
-        
-        ser.close()
+            try:
+                # Current firmware identifies itself in one round trip; older
+                # firmware falls back to probing each sketch's commands
+                detected_sketch = identify_sketch(ser)
+                if detected_sketch:
+                    responses = {}
+                else:
+                    detected_sketch, responses = _probe_sketches(ser)
+            finally:
+                ser.close()
         
         # Summary
         print(f"\n{'='*50}")
@@ -151,8 +512,8 @@ def detect_arduino_sketch(port=None, baud_rate=9600):
         else:
             print("✗ Could not identify sketch")
             print("Raw responses received:")
-            for sketch, responses in responses.items():
-                print(f"  {sketch}: {responses}")
+            for sketch, sketch_responses in responses.items():
+                print(f"  {sketch}: {[as_text(r) for r in sketch_responses]}")
         
         return detected_sketch
         
@@ -160,104 +521,159 @@ def detect_arduino_sketch(port=None, baud_rate=9600):
         print(f"✗ Detection failed: {e}")
         return None
 
-def send_arduino_command(port=None, command='h'):
-    """Send a single command to Arduino"""
+class SerialSession:
+    """One Arduino connection reused across several commands
+    
+    Opening the port resets most boards, so scripts sending a series of
+    commands should do it inside a single session:
+    
+        with SerialSession('/dev/ttyACM0') as session:
+            for command in 'wx':
+                session.send(command)
+    """
+    
+    def __init__(self, port, baud_rate=DEFAULT_BAUD, reset_delay=1):
+        self.port = port
+        self.baud_rate = baud_rate
+        self.reset_delay = reset_delay
+        self.ser = None
+    
+    def __enter__(self):
+        self.ser = open_serial(self.port, self.baud_rate, reset_delay=self.reset_delay)
+        return self
+    
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.ser.close()
+        self.ser = None
+        return False
+    
+    def send(self, command, timeout=0.5):
+        """Send a command and return the reply lines (bytes)"""
+        self.ser.write(encode_command(command))
+        # Returns as soon as the Arduino answers instead of after a fixed delay
+        return read_responses(self.ser, timeout=timeout)
+
+def send_arduino_command(port=None, command='h', baud_rate=DEFAULT_BAUD):
+    """Send one command, or a list of commands over a single connection, to Arduino"""
+    commands = [command] if isinstance(command, str) else command
+    
     # Auto-detect port if not specified
     if port is None:
         print("Auto-detecting Arduino port...")
-        port = auto_detect_arduino_port()
+        port = auto_detect_arduino_port(baud_rate)
         if port is None:
             print("Could not find Arduino port!")
             return False
     
     try:
-        ser = serial.Serial(port=port, baudrate=9600, timeout=1)
-        time.sleep(1)
-        
-        print(f"Sending command: {command}")
-        ser.write(f"{command}\n".encode())
-        time.sleep(0.5)
+        with SerialSession(port, baud_rate) as session:
+            for command in commands:
+                print(f"Sending command: {command}")
+                for response in session.send(command):
+                    print(f"Arduino: {as_text(response)}")
         
-        # Read response
-        while ser.in_waiting > 0:
-            response = ser.readline().decode().strip()
-            if response:
-                print(f"Arduino: {response}")
-        
-        ser.close()
         return True
         
     except Exception as e:
         print(f"Error: {e}")
         return False
 
-def interactive_control(port=None):
+def _reader(ser, stop_event):
+    """Print Arduino output as it arrives until stop_event is set"""
+    partial = b''
+    ser.timeout = 0.2  # Short timeout so the thread notices stop_event promptly
+    while not stop_event.is_set():
+        try:
+            line = ser.read_until(b'\n')
+        except (serial.SerialException, OSError, TypeError):
+            break  # Port closed underneath us
+        if not line:
+            continue
+        if not line.endswith(b'\n'):
+            partial += line
+            continue
+        line = (partial + line).strip()
+        partial = b''
+        if line:
+            print(f"Arduino: {as_text(line)}")
+
+# Interactive-mode handlers. Each takes (send, state, command) and has its
+# command bytes encoded up front, so a keypress is one dict lookup and one write
+
+def _set_speed(key):
+    """Handler for a speed preset key"""
+    payload = CMD_BYTES[key]
+    speed = int(key)
+    def handler(send, state, command):
+        state['speed'] = speed
+        send(payload)
+        print(f"Speed preset set to: {speed}")
+    return handler
+
+def _send_key(key, message):
+    """Handler that sends a single-character command and reports it"""
+    payload = CMD_BYTES[key]
+    def handler(send, state, command):
+        send(payload)
+        print(message)
+    return handler
+
+def _send_raw(send, state, command):
+    """Fallback handler: pass anything unrecognised straight to the Arduino"""
+    send(encode_command(command))
+    print(f"Sent raw command: {command}")
+
+DISPATCH = {
+    'h': lambda send, state, command: print_help(),
+    'q': _send_key('q', "Speed decreased"),
+    'e': _send_key('e', "Speed increased"),
+    'x': _send_key('x', "Stop command sent"),
+    **{key: _send_key(key, f"Moving {key.upper()}") for key in 'wasd'},
+    **{key: _set_speed(key) for key in SPEED_KEYS},
+}
+
+def interactive_control(port=None, baud_rate=DEFAULT_BAUD):
     """Interactive Arduino control with speed control"""
     # Auto-detect port if not specified
     if port is None:
         print("Auto-detecting Arduino port...")
-        port = auto_detect_arduino_port()
+        port = auto_detect_arduino_port(baud_rate)
         if port is None:
             print("Could not find Arduino port!")
             return
     
     try:
-        ser = serial.Serial(port=port, baudrate=9600, timeout=1)
-        time.sleep(1)
+        ser = open_serial(port, baud_rate, reset_delay=1)
         
         print("Interactive Arduino Control with Speed Control")
         print("Movement Commands: w/a/s/d/x (WASD)")
-        print("Speed Commands: 1-5 (speed presets), q/e (slower/faster)")
+        print(f"Speed Commands: {SPEED.min}-{SPEED.max} (speed presets), q/e (slower/faster)")
         print("Other Commands: h (help), quit (quit)")
         print("Speed Control: q (slower), e (faster)")
         
-        current_speed = 3  # Default medium speed (1-5 scale)
+        state = {'speed': SPEED.default}
+        
+        # Arduino output is printed by a reader thread as soon as it arrives, so
+        # the input loop never waits on the serial port
+        stop_event = threading.Event()
+        reader = threading.Thread(target=_reader, args=(ser, stop_event), daemon=True)
+        reader.start()
+        write_lock = threading.Lock()
+        
+        def send(data):
+            with write_lock:
+                ser.write(data)
         
         while True:
-            command = input(f"\nEnter command (speed: {current_speed}): ").strip().lower()
+            command = input(f"\nEnter command (speed: {state['speed']}): ").strip().lower()
             
             if command == 'quit':
                 break
-            elif command == 'h':
-                print_help()
-            elif command in ['1', '2', '3', '4', '5']:
-                # Set specific speed preset (Arduino expects 1-5)
-                current_speed = int(command)
-                ser.write(f"{command}\n".encode())
-                print(f"Speed preset set to: {current_speed}")
-                time.sleep(0.3)
-            elif command == 'q':
-                # Slower speed (Arduino command)
-                ser.write("q\n".encode())
-                print("Speed decreased")
-                time.sleep(0.3)
-            elif command == 'e':
-                # Faster speed (Arduino command)
-                ser.write("e\n".encode())
-                print("Speed increased")
-                time.sleep(0.3)
-            elif command in ['w', 'a', 's', 'd']:
-                # Movement commands (Arduino expects single characters)
-                ser.write(f"{command}\n".encode())
-                print(f"Moving {command.upper()}")
-                time.sleep(0.3)
-            elif command == 'x':
-                # Stop command
-                ser.write("x\n".encode())
-                print("Stop command sent")
-                time.sleep(0.3)
             elif command:
-                # Send raw command
-                ser.write(f"{command}\n".encode())
-                print(f"Sent raw command: {command}")
-                time.sleep(0.3)
-            
-            # Read response
-            while ser.in_waiting > 0:
-                response = ser.readline().decode().strip()
-                if response:
-                    print(f"Arduino: {response}")
+                DISPATCH.get(command, _send_raw)(send, state, command)
         
+        stop_event.set()
+        reader.join()
         ser.close()
         print("Disconnected.")
         
@@ -266,34 +682,55 @@ def interactive_control(port=None):
 
 def print_help():
     """Print detailed help for interactive mode"""
-    print("\n" + "="*50)
-    print("ARDUINO INTERACTIVE CONTROL HELP")
-    print("="*50)
-    print("MOVEMENT COMMANDS:")
-    print("  w = Forward")
-    print("  s = Reverse/Backward")
-    print("  a = Pivot Left")
-    print("  d = Pivot Right")
-    print("  x = Stop")
-    print("")
-    print("SPEED CONTROL:")
-    print("  1-5 = Set speed presets (1=300, 2=600, 3=800, 4=1000, 5=1200 sps)")
-    print("  q   = Decrease speed by 100 steps/sec")
-    print("  e   = Increase speed by 100 steps/sec")
-    print("")
-    print("OTHER COMMANDS:")
-    print("  h     = Show this help")
-    print("  quit  = Quit program")
-    print("")
-    print("EXAMPLES:")
-    print("  w = Move forward at current speed")
-    print("  3 = Set speed to preset 3 (800 sps)")
-    print("  q = Decrease speed")
-    print("  e = Increase speed")
-    print("="*50)
+    lines = [
+        "",
+        "="*50,
+        "ARDUINO INTERACTIVE CONTROL HELP",
+        "="*50,
+        "MOVEMENT COMMANDS:",
+        "  w = Forward",
+        "  s = Reverse/Backward",
+        "  a = Pivot Left",
+        "  d = Pivot Right",
+        "  x = Stop",
+        "",
+        "SPEED CONTROL:",
+        f"  {SPEED.min}-{SPEED.max} = Set speed presets ("
+        + ", ".join(f"{key}={sps}" for key, sps in enumerate(SPEED.presets, start=SPEED.min))
+        + " sps)",
+        f"  q   = Decrease speed by {SPEED.step} steps/sec",
+        f"  e   = Increase speed by {SPEED.step} steps/sec",
+        "",
+        "OTHER COMMANDS:",
+        "  h     = Show this help",
+        "  quit  = Quit program",
+        "",
+        "EXAMPLES:",
+        "  w = Move forward at current speed",
+        f"  {SPEED.default} = Set speed to preset {SPEED.default} "
+        f"({SPEED.presets[SPEED.default - SPEED.min]} sps)",
+        "  q = Decrease speed",
+        "  e = Increase speed",
+        "="*50,
+    ]
+    sys.stdout.write("\n".join(lines) + "\n")
+
+def list_ports():
+    """Print available Arduino ports"""
+    print("Available Arduino ports:")
+    ports = find_arduino_ports()
+    if ports:
+        sys.stdout.write("".join(f"  {port}\n" for port in ports))
+    else:
+        print("  No Arduino ports found")
 
 def main():
     """Main function"""
+    # --list-ports takes no other options, so answer it without building the parser
+    if sys.argv[1:] == ['--list-ports']:
+        list_ports()
+        return
+    
     import argparse
     
     parser = argparse.ArgumentParser(description='Arduino Remote Control with Auto-Detection')
@@ -301,35 +738,32 @@ def main():
                        help='Arduino serial port (auto-detected if not specified)')
     parser.add_argument('--detect', action='store_true',
                        help='Detect current Arduino sketch')
-    parser.add_argument('--command', type=str,
-                       help='Send single command to Arduino')
+    parser.add_argument('--command', type=str, action='append',
+                       help='Send command to Arduino (repeat to send several over one connection)')
     parser.add_argument('--interactive', action='store_true',
                        help='Interactive control mode')
     parser.add_argument('--list-ports', action='store_true',
                        help='List available Arduino ports')
+    parser.add_argument('--baud', type=int, default=DEFAULT_BAUD,
+                       help=f'Serial baud rate (default: {DEFAULT_BAUD})')
     
     args = parser.parse_args()
     
     if args.list_ports:
-        print("Available Arduino ports:")
-        ports = find_arduino_ports()
-        if ports:
-            for port in ports:
-                print(f"  {port}")
-        else:
-            print("  No Arduino ports found")
+        list_ports()
     elif args.detect:
-        detect_arduino_sketch(args.port)
+        detect_arduino_sketch(args.port, args.baud)
     elif args.command:
-        send_arduino_command(args.port, args.command)
+        send_arduino_command(args.port, args.command, args.baud)
     elif args.interactive:
-        interactive_control(args.port)
+        interactive_control(args.port, args.baud)
     else:
         print("Arduino Remote Control with Auto-Detection & Speed Control")
         print("Usage:")
         print("  python3 arduino_control.py --list-ports      # List available ports")
         print("  python3 arduino_control.py --detect          # Detect current sketch")
         print("  python3 arduino_control.py --command w       # Send single command")
+        print("  python3 arduino_control.py --command 2 --command w  # Several commands, one connection")
         print("  python3 arduino_control.py --interactive    # Interactive mode with speed control")
         print("")
         print("Interactive Mode Features:")
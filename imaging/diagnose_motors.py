@@ -3,34 +3,43 @@
 Motor diagnostic script - tests each motor individually
 """
 
-import serial
 import time
 import sys
 
-def test_individual_motors(port='/dev/ttyACM1'):
+from arduino_control import DEFAULT_BAUD, as_text, open_serial, read_responses
+
+# (title, what to watch for, command, seconds to let it run). The drive
+# sketch keeps stepping until told otherwise, so the waits are how long
+# each movement is shown rather than time spent waiting for an answer
+STEPS = [
+    ("Setting slowest speed (preset 1)...", None, b'1\n', 0.5),
+    ("Testing FORWARD (both motors)...", "Watch both motors - they should move together", b'w\n', 3),
+    ("Stopping...", None, b'x\n', 1),
+    ("Testing REVERSE (both motors)...", "Watch both motors - they should move together", b's\n', 3),
+    ("Stopping...", None, b'x\n', 1),
+    ("Testing PIVOT LEFT...", "Left motor should go backward, right motor forward", b'a\n', 3),
+    ("Stopping...", None, b'x\n', 1),
+    ("Testing PIVOT RIGHT...", "Left motor should go forward, right motor backward", b'd\n', 3),
+    ("Stopping...", None, b'x\n', 1),
+]
+
+def test_individual_motors(port='/dev/ttyACM1', baud_rate=DEFAULT_BAUD):
     """Test each motor individually to isolate the problem"""
     try:
         print(f"Connecting to Arduino on {port}...")
-        ser = serial.Serial(port=port, baudrate=9600, timeout=2)
-        time.sleep(2)
+        ser = open_serial(port, baud_rate, timeout=2, reset_delay=2, allow_reset=True)
         
         print("✓ Arduino connected!")
         print("\nTesting individual motor control...")
         
         # Clear any existing data
-        while ser.in_waiting > 0:
-            ser.readline()
+        ser.reset_input_buffer()
         
         # Test 1: Check Arduino response
         print("\n1. Testing Arduino communication...")
         ser.write(b'h\n')
-        time.sleep(1)
         
-        response = ""
-        while ser.in_waiting > 0:
-            line = ser.readline().decode().strip()
-            if line:
-                response += line + "\n"
+        response = "".join(as_text(line) + "\n" for line in read_responses(ser, timeout=1))
         
         if response:
             print("✓ Arduino response:")
@@ -39,55 +48,16 @@ def test_individual_motors(port='/dev/ttyACM1'):
             print("✗ No response from Arduino")
             return False
         
-        # Test 2: Set slowest speed
-        print("\n2. Setting slowest speed (preset 1)...")
-        ser.write(b'1\n')
-        time.sleep(0.5)
-        
-        # Test 3: Try forward (both motors)
-        print("\n3. Testing FORWARD (both motors)...")
-        print("   Watch both motors - they should move together")
-        ser.write(b'w\n')
-        time.sleep(3)
-        
-        # Test 4: Stop
-        print("\n4. Stopping...")
-        ser.write(b'x\n')
-        time.sleep(1)
-        
-        # Test 5: Try reverse (both motors)
-        print("\n5. Testing REVERSE (both motors)...")
-        print("   Watch both motors - they should move together")
-        ser.write(b's\n')
-        time.sleep(3)
-        
-        # Test 6: Stop
-        print("\n6. Stopping...")
-        ser.write(b'x\n')
-        time.sleep(1)
-        
-        # Test 7: Try pivot left (left motor reverse, right motor forward)
-        print("\n7. Testing PIVOT LEFT...")
-        print("   Left motor should go backward, right motor forward")
-        ser.write(b'a\n')
-        time.sleep(3)
-        
-        # Test 8: Stop
-        print("\n8. Stopping...")
-        ser.write(b'x\n')
-        time.sleep(1)
-        
-        # Test 9: Try pivot right (left motor forward, right motor backward)
-        print("\n9. Testing PIVOT RIGHT...")
-        print("   Left motor should go forward, right motor backward")
-        ser.write(b'd\n')
-        time.sleep(3)
-        
-        # Test 10: Stop
-        print("\n10. Stopping...")
-        ser.write(b'x\n')
-        time.sleep(1)
+        write = ser.write
+        sleep = time.sleep
+        for number, (title, hint, command, wait) in enumerate(STEPS, start=2):
+            print(f"\n{number}. {title}")
+            if hint:
+                print(f"   {hint}")
+            write(command)
+            sleep(wait)
         
+        ser.reset_output_buffer()
         ser.close()
         print("\n✓ Diagnostic test completed!")
         print("\nIf no motors moved, the issue is likely:")
@@ -109,6 +79,8 @@ def main():
     parser = argparse.ArgumentParser(description='Diagnose Motor Issues')
     parser.add_argument('--port', type=str, default='/dev/ttyACM1',
                        help='Arduino serial port')
+    parser.add_argument('--baud', type=int, default=DEFAULT_BAUD,
+                       help=f'Serial baud rate (default: {DEFAULT_BAUD})')
     
     args = parser.parse_args()
     
@@ -119,7 +91,7 @@ def main():
     print("Make sure your Arduino is connected and powered.")
     print()
     
-    test_individual_motors(args.port)
+    test_individual_motors(args.port, args.baud)
 
 if __name__ == "__main__":
     main()
@@ -7,14 +7,14 @@ import sys
 import os
 import argparse
 import logging
-import numpy as np
-import cv2
 
 # Add src directory to Python path
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'src'))
 
-from src.trash_detector import TrashDetector, TrashCollector
-from src.trash_detector.config import DEFAULT_CAMERA_INDEX
+# numpy, OpenCV and the detector (YOLO/torch) take seconds to import on a Pi,
+# so they're imported only on the code paths that use them
+from src.trash_detector import TrashCollector
+from src.trash_detector.config import DEFAULT_CAMERA_INDEX, ACCELERATORS, DEFAULT_ACCELERATOR
 
 # Configure logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
@@ -32,6 +32,8 @@ def main():
                        help='Confidence threshold for detections (default: 0.5)')
     parser.add_argument('--advanced', action='store_true',
                        help='Use advanced multi-model detector (much better accuracy)')
+    parser.add_argument('--accelerator', choices=list(ACCELERATORS), default=DEFAULT_ACCELERATOR,
+                       help='Inference backend; all but auto/cpu/cuda need an exported int8 model (default: auto)')
     parser.add_argument('--output', type=str, default=None,
                        help='Output video file path (optional)')
     parser.add_argument('--verbose', action='store_true',
@@ -44,16 +46,35 @@ def main():
                        help='Enable collection mode to track detected trash items')
     parser.add_argument('--location', type=str, default=None,
                        help='Location description for collection mode')
+    parser.add_argument('--no-display', action='store_true',
+                       help='Run collection mode without a preview window (stop with Ctrl+C)')
     
     args = parser.parse_args()
     
     if args.verbose:
         logging.getLogger().setLevel(logging.DEBUG)
     
+    if args.list_cameras:
+        # List available cameras and exit (needs OpenCV, but not the detector)
+        from src.trash_detector.utils.image_utils import list_available_cameras
+        
+        logger.info("Listing available cameras...")
+        cameras = list_available_cameras()
+        if cameras:
+            logger.info(f"Found {len(cameras)} available cameras:")
+            for cam in cameras:
+                logger.info(f"  Camera {cam['index']}: {cam['resolution']} ({cam['backend']})")
+        else:
+            logger.warning("No cameras found!")
+        return
+    
+    from src.trash_detector import TrashDetector
+    
     # Initialize detector
     detector = TrashDetector(model_path=args.model, 
                            confidence_threshold=args.confidence,
-                           use_advanced=args.advanced)
+                           use_advanced=args.advanced,
+                           accelerator=args.accelerator)
     
     # Initialize collector if in collection mode
     collector = None
@@ -62,29 +83,21 @@ def main():
         session_id = collector.start_collection_session(args.location)
         logger.info(f"Collection mode enabled. Session ID: {session_id}")
     
-    if args.list_cameras:
-        # List available cameras and exit
-        logger.info("Listing available cameras...")
-        cameras = detector.list_available_cameras()
-        if cameras:
-            logger.info(f"Found {len(cameras)} available cameras:")
-            for cam in cameras:
-                logger.info(f"  Camera {cam['index']}: {cam['resolution']} ({cam['backend']})")
-        else:
-            logger.warning("No cameras found!")
-        return
-    
     if args.test:
         # Test mode - create a simple test image and run detection
+        import numpy as np
+        import cv2
+        
         logger.info("Running in test mode...")
         
         # Create a test image with some colored rectangles (simulating trash)
         test_image = np.zeros((480, 640, 3), dtype=np.uint8)
         
         # Add some colored rectangles to simulate different types of trash
-        cv2.rectangle(test_image, (100, 100), (200, 200), (255, 0, 0), -1)  # Blue bottle
-        cv2.rectangle(test_image, (300, 150), (400, 250), (0, 0, 255), -1)  # Red can
-        cv2.rectangle(test_image, (150, 300), (300, 350), (255, 255, 255), -1)  # White paper
+        # (filled by slice assignment; bounds are inclusive like cv2.rectangle)
+        test_image[100:201, 100:201] = (255, 0, 0)  # Blue bottle
+        test_image[150:251, 300:401] = (0, 0, 255)  # Red can
+        test_image[300:351, 150:301] = (255, 255, 255)  # White paper
         
         # Run detection on test image
         detections = detector.detect_trash(test_image)
@@ -95,8 +108,8 @@ def main():
             for detection in detections:
                 collector.add_detection(detection, "test_location")
         
-        # Draw detections on test image
-        result_image = detector.draw_detections(test_image.copy(), detections)
+        # Draw detections on test image (in place; it isn't needed afterwards)
+        result_image = detector.draw_detections(test_image, detections)
         
         # Display result
         cv2.imshow('Test Mode - Trash Detection', result_image)
@@ -106,10 +119,7 @@ def main():
         
         # End collection session if active
         if collector:
-            session = collector.end_collection_session()
-            if session:
-                stats = collector.get_session_statistics(session.session_id)
-                logger.info(f"Collection session completed: {stats}")
+            end_collection_session(collector)
         
         return
     
@@ -128,7 +138,8 @@ def main():
     try:
         # Process video with collection integration
         if collector:
-            process_video_with_collection(detector, collector, video_source, args.output, args.location)
+            process_video_with_collection(detector, collector, video_source, args.output, args.location,
+                                          display=not args.no_display)
         else:
             detector.process_video(video_source=video_source, output_path=args.output)
     except KeyboardInterrupt:
@@ -136,47 +147,90 @@ def main():
     finally:
         # End collection session if active
         if collector:
-            session = collector.end_collection_session()
-            if session:
-                stats = collector.get_session_statistics(session.session_id)
-                logger.info(f"Collection session completed: {stats}")
+            end_collection_session(collector)
+
+
+def end_collection_session(collector):
+    """End the active collection session and log its statistics and the all-time totals."""
+    session = collector.end_collection_session()
+    if session:
+        stats = collector.get_session_statistics(session.session_id)
+        logger.info(f"Collection session completed: {stats}")
+        
+        # Served from the stored aggregate; the session history is only
+        # reloaded if that is missing or out of date
+        totals = collector.get_aggregate_statistics()
+        logger.info(f"All sessions: {totals['total_sessions']} sessions, {totals['total_items']} items detected, "
+                    f"{totals['collected_items']} collected ({totals['collection_rate']:.0%})")
 
 
-def process_video_with_collection(detector: TrashDetector, collector: TrashCollector, 
-                                 video_source, output_path: str = None, location: str = None):
+def open_video_writer(output_path: str, fps: float, frame_size):
     """
-    Process video feed with collection tracking.
+    Open a video writer, preferring a hardware H.264 encoder.
+    
+    Tries H.264 ('avc1') with OpenCV's hardware acceleration hint (VideoToolbox
+    on macOS, VAAPI/V4L2 on Linux, OpenCV >= 4.5.2), then falls back to the
+    software 'mp4v' encoder.
     """
     import cv2
-    import time
     
-    # Open video source
-    cap = cv2.VideoCapture(video_source)
+    if hasattr(cv2, 'VIDEOWRITER_PROP_HW_ACCELERATION'):
+        params = [cv2.VIDEOWRITER_PROP_HW_ACCELERATION, cv2.VIDEO_ACCELERATION_ANY]
+        writer = cv2.VideoWriter(output_path, cv2.CAP_ANY, cv2.VideoWriter_fourcc(*'avc1'),
+                                 fps, frame_size, params)
+        if writer.isOpened():
+            logger.info("Using hardware-accelerated H.264 video writer")
+            return writer
+        writer.release()
     
-    if not cap.isOpened():
-        logger.error(f"Could not open video source: {video_source}")
-        return
+    fourcc = cv2.VideoWriter_fourcc(*'mp4v')
+    return cv2.VideoWriter(output_path, fourcc, fps, frame_size)
+
+
+def process_video_with_collection(detector: 'TrashDetector', collector: TrashCollector, 
+                                 video_source, output_path: str = None, location: str = None,
+                                 display: bool = True):
+    """
+    Process video feed with collection tracking.
+    
+    With display off no window is opened and the loop skips imshow/waitKey
+    entirely; Ctrl+C finishes the current frame and stops.
+    """
+    import cv2
+    import numpy as np
+    import time
+    import queue
+    import signal
+    import threading
     
-    # Try different backends for macOS compatibility
+    # Open video source. Cameras fall back to other backends for macOS
+    # compatibility, but only if the default open can't deliver a frame
     if isinstance(video_source, int):
-        logger.info("Trying different camera backends for macOS compatibility...")
-        backends = [cv2.CAP_AVFOUNDATION, cv2.CAP_ANY]
-        for backend in backends:
-            cap.release()
-            cap = cv2.VideoCapture(video_source, backend)
+        cap = None
+        for backend in (None, cv2.CAP_AVFOUNDATION, cv2.CAP_ANY):
+            if backend is None:
+                cap = cv2.VideoCapture(video_source)
+            else:
+                logger.info(f"Trying camera backend {backend} for macOS compatibility...")
+                cap = cv2.VideoCapture(video_source, backend)
             if cap.isOpened():
                 ret, frame = cap.read()
                 if ret and frame is not None:
-                    logger.info(f"Successfully opened camera with backend: {backend}")
+                    if backend is not None:
+                        logger.info(f"Successfully opened camera with backend: {backend}")
                     break
-                else:
-                    logger.warning(f"Camera opened with backend {backend} but failed to read frame")
+                logger.warning(f"Camera opened with backend {backend} but failed to read frame")
             else:
                 logger.warning(f"Failed to open camera with backend: {backend}")
-        
-        if not cap.isOpened():
+            cap.release()
+        else:
             logger.error("Could not open camera with any backend")
             return
+    else:
+        cap = cv2.VideoCapture(video_source)
+        if not cap.isOpened():
+            logger.error(f"Could not open video source: {video_source}")
+            return
     
     # Get video properties
     fps = int(cap.get(cv2.CAP_PROP_FPS))
@@ -188,55 +242,132 @@ def process_video_with_collection(detector: TrashDetector, collector: TrashColle
     # Setup video writer if output path provided
     writer = None
     if output_path:
-        fourcc = cv2.VideoWriter_fourcc(*'mp4v')
-        writer = cv2.VideoWriter(output_path, fourcc, fps, (width, height))
+        writer = open_video_writer(output_path, fps, (width, height))
+    
+    # Read frames on their own thread so camera I/O overlaps detection. A live
+    # camera only keeps the newest frame; files are read in order without drops
+    frames = queue.Queue(maxsize=1)
+    stop_capture = threading.Event()
+    live_source = isinstance(video_source, int)
+    
+    def put_frame(item):
+        while not stop_capture.is_set():
+            try:
+                frames.put(item, timeout=0.1)
+                return
+            except queue.Full:
+                pass
+    
+    def capture_frames():
+        while not stop_capture.is_set():
+            ret, frame = cap.read()
+            if not ret:
+                break
+            if live_source:
+                try:
+                    frames.get_nowait()  # Drop the frame detection didn't get to
+                except queue.Empty:
+                    pass
+            put_frame(frame)
+        put_frame(None)  # End of stream
+    
+    capture_thread = threading.Thread(target=capture_frames, daemon=True)
     
     frame_count = 0
     start_time = time.time()
     last_stats_time = time.time()
     
+    # YOLO letterboxes its input to 640px anyway, so larger frames are shrunk
+    # before detection and the boxes scaled back up to full resolution. The
+    # advanced detector's color passes use absolute pixel-area thresholds, so
+    # it always gets the full frame.
+    detect_width = 640
+    if width > detect_width and not detector.use_advanced:
+        detect_scale = width / detect_width
+    else:
+        detect_scale = 1.0
+    detect_size = (detect_width, max(1, round(height / detect_scale)))
+    
+    # The info/session text is rendered into its own layer, redrawn only when
+    # its contents change (checked at most every 100ms, which also bounds how
+    # often session statistics are recomputed), and stamped onto each frame
+    # with a single masked copy
+    stats = {}
+    overlay = None
+    overlay_mask = None
+    overlay_texts = None
+    last_overlay_refresh = 0.0
+    overlay_refresh_interval = 0.1
+    
+    # Ctrl+C asks the loop to stop after the current frame
+    stop_requested = threading.Event()
+    previous_sigint = signal.signal(signal.SIGINT, lambda signum, frame: stop_requested.set())
+    
     try:
-        while True:
-            ret, frame = cap.read()
-            if not ret:
+        capture_thread.start()
+        while not stop_requested.is_set():
+            frame = frames.get()
+            if frame is None:
                 break
             
             frame_count += 1
             
             # Detect trash in current frame
-            detections = detector.detect_trash(frame)
+            if detect_scale > 1.0:
+                small = cv2.resize(frame, detect_size, interpolation=cv2.INTER_AREA)
+                detections = detector.detect_trash(small)
+                for detection in detections:
+                    x1, y1, x2, y2 = detection['bbox']
+                    detection['bbox'] = (int(x1 * detect_scale), int(y1 * detect_scale),
+                                         int(x2 * detect_scale), int(y2 * detect_scale))
+                    cx, cy = detection['center']
+                    detection['center'] = (int(cx * detect_scale), int(cy * detect_scale))
+            else:
+                detections = detector.detect_trash(frame)
             
             # Add detections to collector
             for detection in detections:
                 collector.add_detection(detection, location)
             
-            # Draw detections on frame
-            frame_with_detections = detector.draw_detections(frame.copy(), detections)
-            
-            # Add frame info
-            info_text = f"Frame: {frame_count} | Detections: {len(detections)} | FPS: {fps}"
-            cv2.putText(frame_with_detections, info_text, (10, 30), 
-                       cv2.FONT_HERSHEY_SIMPLEX, 0.7, (255, 255, 255), 2)
+            # Draw detections on frame (in place; the raw frame isn't needed after detection)
+            frame_with_detections = detector.draw_detections(frame, detections)
             
-            # Add collection stats
-            if collector.current_session:
-                stats = collector.get_session_statistics()
-                collection_text = f"Session: {stats.get('total_items', 0)} items | Collected: {stats.get('collected_items', 0)}"
-                cv2.putText(frame_with_detections, collection_text, (10, 60), 
-                           cv2.FONT_HERSHEY_SIMPLEX, 0.5, (0, 255, 255), 2)
+            # Add frame info and collection stats
+            if overlay is None:
+                overlay = np.zeros((min(70, frame.shape[0]), frame.shape[1], 3), dtype=np.uint8)
+                overlay_mask = np.zeros(overlay.shape[:2] + (1,), dtype=bool)
+            now = time.monotonic()
+            if now - last_overlay_refresh > overlay_refresh_interval:
+                last_overlay_refresh = now
+                collection_text = None
+                if collector.current_session:
+                    stats = collector.get_session_statistics()
+                    collection_text = f"Session: {stats.get('total_items', 0)} items | Collected: {stats.get('collected_items', 0)}"
+                texts = (f"FPS: {fps} | Frame: {frame_count} | Detections: {len(detections)}", collection_text)
+                if texts != overlay_texts:
+                    overlay_texts = texts
+                    overlay.fill(0)
+                    cv2.putText(overlay, texts[0], (10, 30), 
+                               cv2.FONT_HERSHEY_SIMPLEX, 0.7, (255, 255, 255), 2)
+                    if collection_text:
+                        cv2.putText(overlay, collection_text, (10, 60), 
+                                   cv2.FONT_HERSHEY_SIMPLEX, 0.5, (0, 255, 255), 2)
+                    np.any(overlay, axis=2, keepdims=True, out=overlay_mask)
+            np.copyto(frame_with_detections[:overlay.shape[0], :overlay.shape[1]], overlay, where=overlay_mask)
             
             # Display frame
-            cv2.imshow('Trash Detection - Collection Mode', frame_with_detections)
+            if display:
+                cv2.imshow('Trash Detection - Collection Mode', frame_with_detections)
             
             # Save frame if writer is available
             if writer:
                 writer.write(frame_with_detections)
             
-            # Log detection results
-            if detections:
-                logger.info(f"Frame {frame_count}: Found {len(detections)} trash items")
-                for det in detections:
-                    logger.info(f"  - {det['class']}: {det['confidence']:.2f} at {det['center']}")
+            # Log detection results (formatted only if INFO is enabled, as one record)
+            if detections and logger.isEnabledFor(logging.INFO):
+                lines = [f"Frame {frame_count}: Found {len(detections)} trash items"]
+                lines.extend(f"  - {det['class']}: {det['confidence']:.2f} at {det['center']}" for det in detections)
+                logger.info("\n".join(lines))
             
             # Log collection stats every 30 seconds
             current_time = time.time()
@@ -247,7 +378,7 @@ def process_video_with_collection(detector: TrashDetector, collector: TrashColle
                 last_stats_time = current_time
             
             # Check for exit
-            if cv2.waitKey(1) & 0xFF == ord('q'):
+            if display and cv2.waitKey(1) & 0xFF == ord('q'):
                 break
                 
     except KeyboardInterrupt:
@@ -255,10 +386,17 @@ def process_video_with_collection(detector: TrashDetector, collector: TrashColle
     
     finally:
         # Cleanup
+        signal.signal(signal.SIGINT, previous_sigint)
+        if stop_requested.is_set():
+            logger.info("Processing interrupted by user")
+        stop_capture.set()
+        if capture_thread.is_alive():
+            capture_thread.join(timeout=1.0)
         cap.release()
         if writer:
             writer.release()
-        cv2.destroyAllWindows()
+        if display:
+            cv2.destroyAllWindows()
         
         # Performance statistics
         elapsed_time = time.time() - start_time
@@ -15,7 +15,7 @@ import threading
 import queue
 import json
 import requests
-import glob
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from typing import List, Dict, Optional
 
 # Add src directory to Python path
@@ -23,54 +23,35 @@ sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'src'))
 
 from src.trash_detector import TrashDetector, TrashCollector
 from src.trash_detector.config import DEFAULT_CAMERA_INDEX
+from src.trash_detector.utils.image_utils import render_text, stamp_text
+from arduino_control import wait_for_ready
 
 # Configure logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
 
+# Common Arduino port names on Linux/Raspberry Pi: ttyACM (Arduino Uno/Nano),
+# ttyUSB (USB-to-serial adapters) and ttyAMA (Raspberry Pi UART)
+ARDUINO_PORT_PREFIXES = ('ttyACM', 'ttyUSB', 'ttyAMA')
+
+
 def find_arduino_ports():
     """Automatically find Arduino ports on Raspberry Pi"""
-    arduino_ports = []
-    
-    # Common Arduino port patterns on Linux/Raspberry Pi
-    port_patterns = [
-        '/dev/ttyACM*',  # Most common for Arduino Uno/Nano
-        '/dev/ttyUSB*',  # USB-to-serial adapters
-        '/dev/ttyAMA*',  # Raspberry Pi UART
-    ]
-    
-    for pattern in port_patterns:
-        ports = glob.glob(pattern)
-        arduino_ports.extend(ports)
-    
-    # Filter out ports that are likely not Arduino
-    filtered_ports = []
-    for port in arduino_ports:
-        # Skip if it's a Bluetooth or other non-Arduino device
-        if any(skip in port.lower() for skip in ['bluetooth', 'gps', 'modem']):
-            continue
-        filtered_ports.append(port)
-    
-    return sorted(filtered_ports)
+    # One directory read of /dev covers every pattern
+    try:
+        with os.scandir('/dev') as entries:
+            return sorted(entry.path for entry in entries
+                          if entry.name.startswith(ARDUINO_PORT_PREFIXES))
+    except OSError:
+        return []
 
 
-def auto_detect_arduino_port():
-    """Auto-detect the best Arduino port"""
-    ports = find_arduino_ports()
-    
-    if not ports:
-        logger.warning("No Arduino ports found!")
-        logger.warning("Make sure your Arduino is connected via USB.")
-        return None
-    
-    logger.info(f"Found Arduino ports: {ports}")
-    
-    # Try each port to see which one responds
-    for port in ports:
-        try:
-            logger.info(f"Testing {port}...")
-            ser = serial.Serial(port=port, baudrate=9600, timeout=1)
+def _probe_arduino_port(port: str) -> Optional[str]:
+    """Return port if an Arduino answers the help command on it, otherwise None"""
+    try:
+        logger.info(f"Testing {port}...")
+        with serial.Serial(port=port, baudrate=115200, timeout=1) as ser:
             time.sleep(1)  # Give Arduino time to initialize
             
             # Send a test command
@@ -82,27 +63,47 @@ def auto_detect_arduino_port():
                 response = ser.readline().decode().strip()
                 if response:
                     logger.info(f"✓ Arduino responding on {port}: {response}")
-                    ser.close()
                     return port
-            
-            ser.close()
-            
-        except Exception as e:
-            logger.debug(f"✗ {port}: {e}")
-            continue
-    
-    # If no port responded, return the first available one
-    if ports:
-        logger.info(f"Using first available port: {ports[0]}")
-        return ports[0]
+        
+    except Exception as e:
+        logger.debug(f"✗ {port}: {e}")
     
     return None
 
 
+def auto_detect_arduino_port():
+    """Auto-detect the best Arduino port"""
+    ports = find_arduino_ports()
+    
+    if not ports:
+        logger.warning("No Arduino ports found!")
+        logger.warning("Make sure your Arduino is connected via USB.")
+        return None
+    
+    logger.info(f"Found Arduino ports: {ports}")
+    
+    # Probe every port at once; each probe is ~1.5s of waiting on the board,
+    # so detection costs one probe rather than one per port
+    executor = ThreadPoolExecutor(max_workers=len(ports))
+    futures = [executor.submit(_probe_arduino_port, port) for port in ports]
+    try:
+        for future in as_completed(futures):
+            port = future.result()
+            if port:
+                return port
+    finally:
+        # Don't wait for slower probes once we have an answer
+        executor.shutdown(wait=False, cancel_futures=True)
+    
+    # If no port responded, return the first available one
+    logger.info(f"Using first available port: {ports[0]}")
+    return ports[0]
+
+
 class ArduinoController:
     """Handles communication with Arduino R4 for motor control"""
     
-    def __init__(self, serial_port: str = None, baud_rate: int = 9600):
+    def __init__(self, serial_port: str = None, baud_rate: int = 115200):
         # Auto-detect port if not specified
         if serial_port is None:
             logger.info("Auto-detecting Arduino port...")
@@ -126,7 +127,9 @@ class ArduinoController:
                 baudrate=self.baud_rate,
                 timeout=1
             )
-            time.sleep(2)  # Wait for Arduino to initialize
+            # Wait for Arduino to initialize: stop as soon as the sketch prints
+            # READY; sketches without the banner still get the full 2s
+            wait_for_ready(self.serial_connection)
             self.is_connected = True
             logger.info(f"Connected to Arduino on {self.serial_port}")
             
@@ -248,6 +251,17 @@ class PiTrashDetectionSystem:
         self.consecutive_detections = 0
         self.min_consecutive_detections = 2  # Require 2 consecutive detections before moving
         
+        # In headless mode a reader thread queues each line typed on stdin,
+        # so the frame loop never blocks on input
+        self._cmd_q = queue.Queue()
+        if headless:
+            threading.Thread(target=self._read_commands, daemon=True).start()
+        
+    def _read_commands(self):
+        """Queue each line typed on stdin as a lowercase command"""
+        for line in sys.stdin:
+            self._cmd_q.put(line.strip().lower())
+    
     def start(self):
         """Start the trash detection system"""
         logger.info("Starting Pi Trash Detection System...")
@@ -300,8 +314,23 @@ class PiTrashDetectionSystem:
         start_time = time.time()
         last_stats_time = time.time()
         
+        # Overlay text is rasterised once and stamped onto each frame; the
+        # frame/detections line is only re-rendered when its count changes
+        # or every 10 frames
+        motor_sprites = {
+            True: render_text("MOTOR: CONNECTED", (0, 255, 0), 0.5),
+            False: render_text("MOTOR: DISCONNECTED", (0, 0, 255), 0.5),
+        }
+        info_sprite = None
+        info_detections = None
+        
+        # Headless commands are waited on for whatever is left of each
+        # frame's ~30 FPS budget
+        frame_interval = 0.033
+        
         try:
             while True:
+                frame_start = time.monotonic()
                 ret, frame = cap.read()
                 if not ret:
                     logger.error("Failed to read frame from video source")
@@ -318,28 +347,29 @@ class PiTrashDetectionSystem:
                 else:
                     self.consecutive_detections = 0
                 
-                # Draw detections on frame
-                frame_with_detections = self.detector.draw_detections(frame.copy(), detections)
-                
-                # Add system info
-                info_text = f"Frame: {frame_count} | Detections: {len(detections)}"
-                cv2.putText(frame_with_detections, info_text, (10, 30), 
-                           cv2.FONT_HERSHEY_SIMPLEX, 0.7, (255, 255, 255), 2)
-                
-                # Add motor status
-                motor_status = "MOTOR: CONNECTED" if self.arduino_controller.is_connected else "MOTOR: DISCONNECTED"
-                cv2.putText(frame_with_detections, motor_status, (10, 60), 
-                           cv2.FONT_HERSHEY_SIMPLEX, 0.5, (0, 255, 0) if self.arduino_controller.is_connected else (0, 0, 255), 2)
-                
-                # Add detection confidence info
-                if detections:
-                    best_detection = max(detections, key=lambda d: d.get('confidence', 0))
-                    conf_text = f"Best: {best_detection.get('class', 'trash')} ({best_detection.get('confidence', 0):.2f})"
-                    cv2.putText(frame_with_detections, conf_text, (10, 90), 
-                               cv2.FONT_HERSHEY_SIMPLEX, 0.5, (0, 255, 255), 2)
-                
-                # Display frame (only if not in headless mode)
+                # Display frame (only if not in headless mode; nobody sees the
+                # overlays otherwise)
                 if not self.headless:
+                    # Draw detections on frame (in place; it is discarded next iteration)
+                    frame_with_detections = self.detector.draw_detections(frame, detections)
+                    
+                    # Add system info
+                    if len(detections) != info_detections or frame_count % 10 == 0:
+                        info_detections = len(detections)
+                        info_text = f"Frame: {frame_count} | Detections: {info_detections}"
+                        info_sprite = render_text(info_text, (255, 255, 255), 0.7)
+                    stamp_text(frame_with_detections, info_sprite, (10, 30))
+                    
+                    # Add motor status
+                    stamp_text(frame_with_detections, motor_sprites[bool(self.arduino_controller.is_connected)], (10, 60))
+                    
+                    # Add detection confidence info
+                    if detections:
+                        best_detection = max(detections, key=lambda d: d.get('confidence', 0))
+                        conf_text = f"Best: {best_detection.get('class', 'trash')} ({best_detection.get('confidence', 0):.2f})"
+                        cv2.putText(frame_with_detections, conf_text, (10, 90), 
+                                   cv2.FONT_HERSHEY_SIMPLEX, 0.5, (0, 255, 255), 2)
+                    
                     cv2.imshow('Pi Trash Detection with Motor Control', frame_with_detections)
                     
                     # Handle keyboard input (WASD scheme)
@@ -360,12 +390,12 @@ class PiTrashDetectionSystem:
                         self.arduino_controller.send_command('d')
                 else:
                     # In headless mode, check for manual control via stdin
-                    import select
-                    import sys
-                    
-                    # Check if there's input available (non-blocking)
-                    if select.select([sys.stdin], [], [], 0)[0]:
-                        key = sys.stdin.readline().strip().lower()
+                    timeout = max(0.0, frame_start + frame_interval - time.monotonic())
+                    try:
+                        key = self._cmd_q.get(timeout=timeout)
+                    except queue.Empty:
+                        pass
+                    else:
                         if key == 'q':
                             break
                         elif key == 'x':  # Stop motor
@@ -382,9 +412,6 @@ class PiTrashDetectionSystem:
                             self.arduino_controller.send_command('d')
                         elif key == 'h':  # Help
                             self.print_headless_help()
-                    
-                    # Add a small delay to prevent excessive CPU usage
-                    time.sleep(0.033)  # ~30 FPS
                 
                 # Log performance every 100 frames
                 if frame_count % 100 == 0:
@@ -21,6 +21,7 @@ sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'src'))
 
 from src.trash_detector import TrashDetector, TrashCollector
 from src.trash_detector.config import DEFAULT_CAMERA_INDEX
+from arduino_control import wait_for_ready
 
 # Configure logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
@@ -33,7 +34,7 @@ os.environ['QT_QPA_PLATFORM'] = 'offscreen'
 class ArduinoController:
     """Handles communication with Arduino R4 for motor control"""
     
-    def __init__(self, serial_port: str = '/dev/ttyACM0', baud_rate: int = 9600):
+    def __init__(self, serial_port: str = '/dev/ttyACM0', baud_rate: int = 115200):
         self.serial_port = serial_port
         self.baud_rate = baud_rate
         self.serial_connection = None
@@ -49,7 +50,9 @@ class ArduinoController:
                 baudrate=self.baud_rate,
                 timeout=1
             )
-            time.sleep(2)  # Wait for Arduino to initialize
+            # Wait for Arduino to initialize: stop as soon as the sketch prints
+            # READY; sketches without the banner still get the full 2s
+            wait_for_ready(self.serial_connection)
             self.is_connected = True
             logger.info(f"Connected to Arduino on {self.serial_port}")
             
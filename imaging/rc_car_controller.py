@@ -7,31 +7,29 @@ Sends steering and throttle commands in the format: <steer,throttle>
 import serial
 import time
 import sys
-import glob
 import os
+import functools
+
+
+# Most common for Arduino Uno/R4 (ttyACM) and USB-to-serial adapters (ttyUSB)
+PORT_PREFIXES = ('ttyACM', 'ttyUSB')
+
+
+@functools.lru_cache(maxsize=1024)
+def encode_rc_command(steer_angle, throttle):
+    """Return the <steer,throttle> line as bytes, reused for repeated values"""
+    return f"<{steer_angle},{throttle}>\n".encode()
 
 
 def find_arduino_ports():
     """Automatically find Arduino ports"""
-    arduino_ports = []
-    
-    port_patterns = [
-        '/dev/ttyACM*',  # Most common for Arduino Uno/R4
-        '/dev/ttyUSB*',  # USB-to-serial adapters
-    ]
-    
-    for pattern in port_patterns:
-        ports = glob.glob(pattern)
-        arduino_ports.extend(ports)
-    
-    # Filter out ports that are likely not Arduino
-    filtered_ports = []
-    for port in arduino_ports:
-        if any(skip in port.lower() for skip in ['bluetooth', 'gps', 'modem']):
-            continue
-        filtered_ports.append(port)
-    
-    return sorted(filtered_ports)
+    # One directory read of /dev covers every ttyACM*/ttyUSB* device
+    try:
+        with os.scandir('/dev') as entries:
+            return sorted(entry.path for entry in entries
+                          if entry.name.startswith(PORT_PREFIXES))
+    except OSError:
+        return []
 
 
 def auto_detect_arduino_port():
@@ -46,7 +44,7 @@ def auto_detect_arduino_port():
     return ports[0]  # Use first available port
 
 
-def send_rc_command(port, steer_angle, throttle):
+def send_rc_command(port, steer_angle, throttle, ser=None):
     """
     Send RC car command to Arduino
     
@@ -54,6 +52,7 @@ def send_rc_command(port, steer_angle, throttle):
         port: Serial port (e.g., '/dev/ttyACM0')
         steer_angle: Steering angle (45-135, 90 = center)
         throttle: Throttle speed (-255 to 255, 0 = stop)
+        ser: Already open serial connection to write to instead of opening port
     
     Returns:
         bool: True if command sent successfully
@@ -64,11 +63,13 @@ def send_rc_command(port, steer_angle, throttle):
         throttle = max(-255, min(255, int(throttle)))
         
         # Format command: <steer,throttle>
-        command = f"<{steer_angle},{throttle}>\n"
+        command = encode_rc_command(steer_angle, throttle)
         
-        ser = serial.Serial(port=port, baudrate=115200, timeout=0.1)
-        ser.write(command.encode())
-        ser.close()
+        if ser is not None:
+            ser.write(command)
+        else:
+            with serial.Serial(port=port, baudrate=115200, timeout=0.1) as ser:
+                ser.write(command)
         
         return True
         
@@ -100,6 +101,14 @@ def interactive_control(port=None):
     current_throttle = 0  # Stop
     throttle_step = 30  # Throttle increment per keypress
     
+    # Keep one connection for the whole session rather than opening the port
+    # (and resetting the board) for every keypress
+    try:
+        ser = serial.Serial(port=port, baudrate=115200, timeout=0.1)
+    except serial.SerialException as e:
+        print(f"Could not open {port}: {e}")
+        return
+    
     try:
         while True:
             command = input(f"Steer: {current_steer}, Throttle: {current_throttle} > ").strip().lower()
@@ -133,17 +142,19 @@ def interactive_control(port=None):
                 continue
             
             # Send command to Arduino
-            send_rc_command(port, current_steer, current_throttle)
+            send_rc_command(port, current_steer, current_throttle, ser)
             print(f"Sent: <{current_steer},{current_throttle}>")
             time.sleep(0.1)  # Small delay between commands
         
         # Stop on exit
-        send_rc_command(port, 90, 0)
+        send_rc_command(port, 90, 0, ser)
         print("Stopped and disconnected.")
         
     except KeyboardInterrupt:
-        send_rc_command(port, 90, 0)
+        send_rc_command(port, 90, 0, ser)
         print("\nStopped and disconnected.")
+    finally:
+        ser.close()
 
 
 def main():
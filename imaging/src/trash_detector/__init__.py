@@ -6,7 +6,6 @@ A computer vision-based trash detection system that can identify and classify
 various types of litter from video feeds.
 """
 
-from .detector import TrashDetector
 from .collection.trash_collector import TrashCollector, TrashItem, CollectionSession
 from .config import TRASH_CLASSES, DEFAULT_CONFIDENCE_THRESHOLD, DEFAULT_CAMERA_INDEX
 
@@ -22,3 +21,13 @@ __all__ = [
     'DEFAULT_CONFIDENCE_THRESHOLD',
     'DEFAULT_CAMERA_INDEX'
 ]
+
+
+def __getattr__(name):
+    # TrashDetector pulls in OpenCV and the YOLO stack, so it is only imported
+    # on first use; collection-only callers never pay for it
+    if name == 'TrashDetector':
+        from .detector import TrashDetector
+        globals()['TrashDetector'] = TrashDetector
+        return TrashDetector
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
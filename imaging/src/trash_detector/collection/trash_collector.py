@@ -3,17 +3,76 @@
 Trash collection logic and management system.
 """
 
+import copy
+import hashlib
 import json
+import mmap
+import os
+import sys
 import time
 import logging
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from heapq import nlargest
+from operator import itemgetter
 from typing import List, Dict, Optional
 from datetime import datetime
 from dataclasses import dataclass, asdict
 from pathlib import Path
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
 logger = logging.getLogger(__name__)
 
 
+def _orjson_default(obj):
+    """Match json's default=str output for types orjson doesn't handle natively."""
+    # json writes float subclasses as numbers; orjson hands them to default
+    if isinstance(obj, float):
+        return float(obj)
+    return str(obj)
+
+
+def _dumps(obj) -> bytes:
+    """Serialize to indented JSON, using orjson when it is installed."""
+    if orjson is not None:
+        return orjson.dumps(
+            obj,
+            option=orjson.OPT_INDENT_2 | orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_SERIALIZE_NUMPY,
+            default=_orjson_default
+        )
+    return json.dumps(obj, indent=2, default=str).encode()
+
+
+def _loads(data: bytes):
+    """Parse JSON bytes, using orjson when it is installed."""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def _read_session_file(file_path: Path) -> Dict:
+    """Decode a stored session file (MessagePack or legacy JSON)."""
+    if file_path.suffix != '.msgpack' and orjson is None:
+        return json.loads(file_path.read_bytes())
+    
+    # Map the file so the C decoders parse straight from the page cache
+    # instead of from an intermediate bytes copy
+    with open(file_path, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        with memoryview(mm) as data:
+            if file_path.suffix == '.msgpack':
+                return msgpack.unpackb(data, raw=False)
+            return orjson.loads(data)
+
+
 @dataclass
 class TrashItem:
     """Represents a detected trash item."""
@@ -54,11 +113,28 @@ class TrashCollector:
         """
         self.data_dir = Path(data_dir)
         self.data_dir.mkdir(exist_ok=True)
+        self.aggregate_path = self.data_dir / "aggregate.json"
         self.current_session: Optional[CollectionSession] = None
-        self.collection_history: List[CollectionSession] = []
+        self._statistics_cache: Dict[str, Dict] = {}
         
-        # Load existing collection history
-        self._load_collection_history()
+        # Existing collection history is only parsed when something needs it;
+        # ending a session and reading aggregate statistics normally don't
+        self._collection_history: Optional[List[CollectionSession]] = None
+        self._sessions_index: Optional[Dict[str, CollectionSession]] = None
+    
+    @property
+    def collection_history(self) -> List[CollectionSession]:
+        """Completed sessions, loaded from disk on first use."""
+        if self._collection_history is None:
+            self._load_collection_history()
+        return self._collection_history
+    
+    @property
+    def _sessions_by_id(self) -> Dict[str, CollectionSession]:
+        """Completed sessions by id, loaded from disk on first use."""
+        if self._sessions_index is None:
+            self._load_collection_history()
+        return self._sessions_index
     
     def start_collection_session(self, location: Optional[str] = None) -> str:
         """
@@ -95,10 +171,18 @@ class TrashCollector:
         self.current_session.collected_items = sum(1 for item in self.current_session.items if item.collected)
         
         # Save session data
-        self._save_session(self.current_session)
+        session_file = self._save_session(self.current_session)
+        
+        # Add to history (if it hasn't been loaded yet, it will be read back
+        # from the file just saved)
+        if self._collection_history is not None:
+            self._collection_history.append(self.current_session)
+            self._sessions_index[self.current_session.session_id] = self.current_session
         
-        # Add to history
-        self.collection_history.append(self.current_session)
+        # Fold the session into the precomputed aggregate statistics
+        stats = self._compute_session_statistics(self.current_session)
+        self._statistics_cache[self.current_session.session_id] = copy.deepcopy(stats)
+        self._update_aggregate(stats, session_file)
         
         logger.info(f"Ended collection session: {self.current_session.session_id}")
         logger.info(f"Total items detected: {self.current_session.total_items}")
@@ -173,19 +257,26 @@ class TrashCollector:
         if session_id is None:
             session = self.current_session
         else:
-            session = next((s for s in self.collection_history if s.session_id == session_id), None)
+            # Completed sessions never change, so their statistics are computed once
+            cached = self._statistics_cache.get(session_id)
+            if cached is not None:
+                return copy.deepcopy(cached)
+            session = self._sessions_by_id.get(session_id)
         
         if session is None:
             return {}
         
+        stats = self._compute_session_statistics(session)
+        if session_id is not None:
+            self._statistics_cache[session_id] = copy.deepcopy(stats)
+        return stats
+    
+    @staticmethod
+    def _compute_session_statistics(session: CollectionSession) -> Dict:
+        """Build the statistics dictionary for a session."""
         # Count items by class
-        class_counts = {}
-        collected_by_class = {}
-        
-        for item in session.items:
-            class_counts[item.class_name] = class_counts.get(item.class_name, 0) + 1
-            if item.collected:
-                collected_by_class[item.class_name] = collected_by_class.get(item.class_name, 0) + 1
+        class_counts = Counter(item.class_name for item in session.items)
+        collected_by_class = Counter(item.class_name for item in session.items if item.collected)
         
         return {
             'session_id': session.session_id,
@@ -194,8 +285,8 @@ class TrashCollector:
             'total_items': session.total_items,
             'collected_items': session.collected_items,
             'collection_rate': session.collected_items / session.total_items if session.total_items > 0 else 0,
-            'items_by_class': class_counts,
-            'collected_by_class': collected_by_class,
+            'items_by_class': dict(class_counts),
+            'collected_by_class': dict(collected_by_class),
             'duration_minutes': (session.end_time - session.start_time).total_seconds() / 60 if session.end_time else None
         }
     
@@ -208,6 +299,40 @@ class TrashCollector:
         """
         return [self.get_session_statistics(session.session_id) for session in self.collection_history]
     
+    def get_aggregate_statistics(self, top: Optional[int] = None) -> Dict:
+        """
+        Get statistics aggregated over all completed sessions.
+        
+        The aggregate is kept up to date on disk as sessions end, so this
+        only loads and rescans the full history when the cached copy is
+        missing or stale.
+        
+        Args:
+            top: Only report the N most frequently detected classes (None for all)
+            
+        Returns:
+            Aggregate statistics dictionary
+        """
+        fingerprint = self._session_files_fingerprint()
+        aggregate = self._load_aggregate(fingerprint)
+        if aggregate is None:
+            aggregate = self._compute_aggregate()
+            self._save_aggregate(aggregate, fingerprint)
+        
+        if top is not None:
+            items_by_class = dict(nlargest(top, aggregate['items_by_class'].items(), key=itemgetter(1)))
+            collected_by_class = aggregate['collected_by_class']
+            aggregate = {
+                **aggregate,
+                'items_by_class': items_by_class,
+                'collected_by_class': {name: collected_by_class[name] for name in items_by_class if name in collected_by_class}
+            }
+        
+        return {
+            **aggregate,
+            'collection_rate': aggregate['collected_items'] / aggregate['total_items'] if aggregate['total_items'] > 0 else 0
+        }
+    
     def export_session_data(self, session_id: str, format: str = 'json') -> Optional[str]:
         """
         Export session data to a file.
@@ -219,23 +344,22 @@ class TrashCollector:
         Returns:
             Path to exported file or None if failed
         """
-        session = next((s for s in self.collection_history if s.session_id == session_id), None)
+        session = self._sessions_by_id.get(session_id)
         if session is None:
             logger.error(f"Session {session_id} not found")
             return None
         
         if format == 'json':
             file_path = self.data_dir / f"{session_id}.json"
-            with open(file_path, 'w') as f:
-                json.dump(asdict(session), f, indent=2, default=str)
+            file_path.write_bytes(_dumps(asdict(session)))
         elif format == 'csv':
             file_path = self.data_dir / f"{session_id}.csv"
             import csv
-            with open(file_path, 'w', newline='') as f:
+            with open(file_path, 'w', newline='', buffering=1 << 20) as f:
                 writer = csv.writer(f)
                 writer.writerow(['class_name', 'confidence', 'bbox', 'center', 'timestamp', 'location', 'collected', 'collection_timestamp'])
-                for item in session.items:
-                    writer.writerow([
+                writer.writerows(
+                    (
                         item.class_name,
                         item.confidence,
                         str(item.bbox),
@@ -244,7 +368,9 @@ class TrashCollector:
                         item.location or '',
                         item.collected,
                         item.collection_timestamp.isoformat() if item.collection_timestamp else ''
-                    ])
+                    )
+                    for item in session.items
+                )
         else:
             logger.error(f"Unsupported format: {format}")
             return None
@@ -252,33 +378,137 @@ class TrashCollector:
         logger.info(f"Exported session data to: {file_path}")
         return str(file_path)
     
-    def _save_session(self, session: CollectionSession):
-        """Save session data to disk."""
-        file_path = self.data_dir / f"{session.session_id}.json"
-        with open(file_path, 'w') as f:
-            json.dump(asdict(session), f, indent=2, default=str)
+    def _save_session(self, session: CollectionSession) -> Path:
+        """Save session data to disk (MessagePack when available, JSON otherwise)."""
+        if msgpack is not None:
+            file_path = self.data_dir / f"{session.session_id}.msgpack"
+            file_path.write_bytes(msgpack.packb(asdict(session), default=str, use_bin_type=True))
+        else:
+            file_path = self.data_dir / f"{session.session_id}.json"
+            file_path.write_bytes(_dumps(asdict(session)))
+        return file_path
+    
+    def _session_files(self) -> List[Path]:
+        """Find stored session files, preferring MessagePack over legacy JSON."""
+        files = {file_path.stem: file_path for file_path in self.data_dir.glob("session_*.json")}
+        if msgpack is not None:
+            files.update((file_path.stem, file_path) for file_path in self.data_dir.glob("session_*.msgpack"))
+        return sorted(files.values())
+    
+    def _session_files_fingerprint(self, exclude: Optional[Path] = None) -> str:
+        """Hash of the stored session files' names and mtimes; changes when any file is added or replaced."""
+        digest = hashlib.blake2b(digest_size=16)
+        for file_path in self._session_files():
+            if file_path != exclude:
+                digest.update(f"{file_path.name}:{file_path.stat().st_mtime_ns}\n".encode())
+        return digest.hexdigest()
+    
+    def _compute_aggregate(self) -> Dict:
+        """Rebuild aggregate statistics from the full collection history."""
+        total_items = collected_items = 0
+        items_by_class = Counter()
+        collected_by_class = Counter()
+        
+        # Bind the Counter updates once; this loop runs once per stored session
+        add_items = items_by_class.update
+        add_collected = collected_by_class.update
+        
+        history = self.get_collection_history()
+        for stats in history:
+            total_items += stats['total_items']
+            collected_items += stats['collected_items']
+            add_items(stats['items_by_class'])
+            add_collected(stats['collected_by_class'])
+        
+        return {
+            'total_sessions': len(history),
+            'total_items': total_items,
+            'collected_items': collected_items,
+            'items_by_class': dict(items_by_class),
+            'collected_by_class': dict(collected_by_class)
+        }
+    
+    @staticmethod
+    def _merge_session_statistics(aggregate: Dict, stats: Dict):
+        """Add one session's statistics to an aggregate in place."""
+        aggregate['total_sessions'] += 1
+        aggregate['total_items'] += stats['total_items']
+        aggregate['collected_items'] += stats['collected_items']
+        
+        items_by_class = Counter(aggregate['items_by_class'])
+        items_by_class.update(stats['items_by_class'])
+        aggregate['items_by_class'] = dict(items_by_class)
+        
+        collected_by_class = Counter(aggregate['collected_by_class'])
+        collected_by_class.update(stats['collected_by_class'])
+        aggregate['collected_by_class'] = dict(collected_by_class)
+    
+    def _update_aggregate(self, stats: Dict, session_file: Path):
+        """Merge a just-completed session's statistics (already saved to session_file) into the cached aggregate."""
+        aggregate = self._load_aggregate(self._session_files_fingerprint(exclude=session_file))
+        if aggregate is None:
+            aggregate = self._compute_aggregate()
+        else:
+            self._merge_session_statistics(aggregate, stats)
+        self._save_aggregate(aggregate, self._session_files_fingerprint())
+    
+    def _load_aggregate(self, expected_fingerprint: str) -> Optional[Dict]:
+        """Load the cached aggregate, or None if it is missing or out of date."""
+        try:
+            aggregate = _loads(self.aggregate_path.read_bytes())
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            logger.warning(f"Failed to load aggregate statistics from {self.aggregate_path}: {e}")
+            return None
+        
+        # The fingerprint covers every session file's name and mtime, so it
+        # changes when a session is added, removed or replaced
+        if aggregate.pop('sessions_fingerprint', None) != expected_fingerprint:
+            return None
+        return aggregate
+    
+    def _save_aggregate(self, aggregate: Dict, fingerprint: str):
+        """Save aggregate statistics to disk, stamped with the session files' fingerprint."""
+        self.aggregate_path.write_bytes(_dumps({**aggregate, 'sessions_fingerprint': fingerprint}))
+    
+    def _load_session_file(self, file_path: Path) -> Optional[CollectionSession]:
+        """Load a single session from disk, or None if it cannot be read."""
+        try:
+            data = _read_session_file(file_path)
+            
+            # Convert timestamps back to datetime objects
+            data['start_time'] = datetime.fromisoformat(data['start_time'])
+            if data['end_time']:
+                data['end_time'] = datetime.fromisoformat(data['end_time'])
+            
+            for item_data in data['items']:
+                # Share one string object per class name across all loaded items
+                item_data['class_name'] = sys.intern(item_data['class_name'])
+                item_data['timestamp'] = datetime.fromisoformat(item_data['timestamp'])
+                if item_data['collection_timestamp']:
+                    item_data['collection_timestamp'] = datetime.fromisoformat(item_data['collection_timestamp'])
+            data['items'] = [TrashItem(**item_data) for item_data in data['items']]
+            
+            return CollectionSession(**data)
+            
+        except Exception as e:
+            logger.error(f"Failed to load session from {file_path}: {e}")
+            return None
     
     def _load_collection_history(self):
         """Load existing collection history from disk."""
-        for file_path in self.data_dir.glob("session_*.json"):
-            try:
-                with open(file_path, 'r') as f:
-                    data = json.load(f)
-                
-                # Convert timestamps back to datetime objects
-                data['start_time'] = datetime.fromisoformat(data['start_time'])
-                if data['end_time']:
-                    data['end_time'] = datetime.fromisoformat(data['end_time'])
-                
-                for item_data in data['items']:
-                    item_data['timestamp'] = datetime.fromisoformat(item_data['timestamp'])
-                    if item_data['collection_timestamp']:
-                        item_data['collection_timestamp'] = datetime.fromisoformat(item_data['collection_timestamp'])
-                
-                session = CollectionSession(**data)
-                self.collection_history.append(session)
-                
-            except Exception as e:
-                logger.error(f"Failed to load session from {file_path}: {e}")
-        
-        logger.info(f"Loaded {len(self.collection_history)} collection sessions from history")
+        session_files = self._session_files()
+        history = []
+        
+        if session_files:
+            # File reads and the C decoders release the GIL, so sessions load in parallel;
+            # map() keeps the results in sorted file order
+            max_workers = min(16, (os.cpu_count() or 1) * 2, len(session_files))
+            with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                sessions = list(executor.map(self._load_session_file, session_files))
+            history.extend(session for session in sessions if session is not None)
+        
+        self._collection_history = history
+        self._sessions_index = {session.session_id: session for session in history}
+        logger.info(f"Loaded {len(history)} collection sessions from history")
@@ -46,6 +46,25 @@ TRASH_CLASSES: List[str] = [
 # Default model path
 DEFAULT_MODEL_PATH = 'yolov8n.pt'
 
+# Inference accelerators: name -> (default model, ultralytics device).
+# Everything but auto/cpu/cuda runs an int8 export of the default model, made
+# beforehand with `yolo export model=yolov8n.pt format=<format> int8=True`
+# (format tflite, openvino, engine or edgetpu). The int8 CPU backends roughly
+# double throughput on a Pi's NEON cores: TFLite runs on XNNPACK, OpenVINO
+# on its ARM plugin
+ACCELERATORS = {
+    'auto': (DEFAULT_MODEL_PATH, None),  # Let ultralytics pick CUDA if present
+    'cpu': (DEFAULT_MODEL_PATH, 'cpu'),
+    'cuda': (DEFAULT_MODEL_PATH, 'cuda'),
+    'tflite_int8': ('yolov8n_saved_model/yolov8n_int8.tflite', 'cpu'),
+    'openvino_int8': ('yolov8n_int8_openvino_model', 'cpu'),
+    'tensorrt': ('yolov8n.engine', 'cuda'),
+    'edgetpu': ('yolov8n_saved_model/yolov8n_full_integer_quant_edgetpu.tflite', 'cpu'),
+}
+
+# Default accelerator
+DEFAULT_ACCELERATOR = 'auto'
+
 # Default confidence threshold
 DEFAULT_CONFIDENCE_THRESHOLD = 0.5
 
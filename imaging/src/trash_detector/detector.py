@@ -9,6 +9,7 @@ import time
 import logging
 from typing import List, Dict, Optional
 
+from .config import DEFAULT_ACCELERATOR
 from .models.yolo_model import YOLOModel
 from .models.advanced_detector import AdvancedTrashDetector
 from .utils.image_utils import draw_detections, list_available_cameras
@@ -22,7 +23,8 @@ class TrashDetector:
     various types of litter from video feeds.
     """
     
-    def __init__(self, model_path: Optional[str] = None, confidence_threshold: float = 0.5, use_advanced: bool = False):
+    def __init__(self, model_path: Optional[str] = None, confidence_threshold: float = 0.5, use_advanced: bool = False,
+                 accelerator: str = DEFAULT_ACCELERATOR):
         """
         Initialize the trash detector.
         
@@ -30,6 +32,7 @@ class TrashDetector:
             model_path: Path to pre-trained model (optional)
             confidence_threshold: Minimum confidence for detections
             use_advanced: Use advanced multi-model detector for better accuracy
+            accelerator: Inference backend for the YOLO model (see config.ACCELERATORS)
         """
         self.confidence_threshold = confidence_threshold
         self.model_path = model_path
@@ -39,7 +42,8 @@ class TrashDetector:
         if use_advanced:
             self.model = AdvancedTrashDetector(confidence_threshold=confidence_threshold)
         else:
-            self.model = YOLOModel(model_path=model_path, confidence_threshold=confidence_threshold)
+            self.model = YOLOModel(model_path=model_path, confidence_threshold=confidence_threshold,
+                                   accelerator=accelerator)
     
     def detect_trash(self, frame: np.ndarray) -> List[Dict]:
         """
@@ -6,7 +6,7 @@ YOLO model handler for trash detection.
 import logging
 from typing import List, Dict, Optional
 import numpy as np
-from ..config import TRASH_CLASSES, DEFAULT_MODEL_PATH, ROTATION_ANGLES, ROTATION_PENALTY
+from ..config import TRASH_CLASSES, ACCELERATORS, DEFAULT_ACCELERATOR, ROTATION_ANGLES, ROTATION_PENALTY
 from ..utils.image_utils import rotate_image, adjust_rotated_coords, remove_duplicate_detections
 from ..utils.detection_filters import is_likely_trash
 
@@ -16,16 +16,19 @@ logger = logging.getLogger(__name__)
 class YOLOModel:
     """YOLO model handler for trash detection."""
     
-    def __init__(self, model_path: Optional[str] = None, confidence_threshold: float = 0.5):
+    def __init__(self, model_path: Optional[str] = None, confidence_threshold: float = 0.5,
+                 accelerator: str = DEFAULT_ACCELERATOR):
         """
         Initialize the YOLO model.
         
         Args:
-            model_path: Path to model file (defaults to yolov8n.pt)
+            model_path: Path to model file (defaults to the accelerator's model)
             confidence_threshold: Minimum confidence for detections
+            accelerator: Inference backend, one of config.ACCELERATORS
         """
+        default_model, self.device = ACCELERATORS[accelerator]
         self.confidence_threshold = confidence_threshold
-        self.model_path = model_path or DEFAULT_MODEL_PATH
+        self.model_path = model_path or default_model
         self.model = None
         self.class_names = TRASH_CLASSES
         
@@ -55,7 +58,7 @@ class YOLOModel:
         
         try:
             # Run inference on original frame
-            results = self.model(frame, verbose=False)
+            results = self.model(frame, verbose=False, device=self.device)
             detections = self._process_detections(results, frame)
             
             # Run inference on rotated frames for better detection
@@ -111,7 +114,7 @@ class YOLOModel:
                 rotated_frame = rotate_image(frame, angle)
                 
                 # Run inference on rotated frame
-                results = self.model(rotated_frame, verbose=False)
+                results = self.model(rotated_frame, verbose=False, device=self.device)
                 
                 # Process detections and adjust coordinates back to original frame
                 for result in results:
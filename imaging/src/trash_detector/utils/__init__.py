@@ -9,6 +9,8 @@ from .image_utils import (
     calculate_iou,
     remove_duplicate_detections,
     draw_detections,
+    render_text,
+    stamp_text,
     list_available_cameras
 )
 from .detection_filters import (
@@ -22,6 +24,8 @@ __all__ = [
     'calculate_iou',
     'remove_duplicate_detections',
     'draw_detections',
+    'render_text',
+    'stamp_text',
     'list_available_cameras',
     'is_likely_trash',
     'filter_detections_by_size_and_confidence'
@@ -5,7 +5,8 @@ Image processing utilities for trash detection.
 
 import cv2
 import numpy as np
-from typing import List, Dict, Tuple
+from typing import List, Dict, Optional, Tuple
+from concurrent.futures import ThreadPoolExecutor
 import logging
 
 logger = logging.getLogger(__name__)
@@ -127,36 +128,66 @@ def draw_detections(frame: np.ndarray, detections: List[Dict]) -> np.ndarray:
     return frame
 
 
+def render_text(text: str, color: Tuple[int, int, int], scale: float) -> Tuple[np.ndarray, np.ndarray, int]:
+    """Rasterise a line of overlay text once; returns (sprite, mask, baseline row)."""
+    (width, height), baseline = cv2.getTextSize(text, cv2.FONT_HERSHEY_SIMPLEX, scale, 2)
+    sprite = np.zeros((height + baseline + 4, width + 4, 3), dtype=np.uint8)
+    cv2.putText(sprite, text, (2, height + 2), cv2.FONT_HERSHEY_SIMPLEX, scale, color, 2)
+    return sprite, sprite.any(axis=2, keepdims=True), height + 2
+
+
+def stamp_text(frame: np.ndarray, rendered: Tuple[np.ndarray, np.ndarray, int], origin: Tuple[int, int]):
+    """Copy a rendered text sprite onto frame as cv2.putText would draw it at origin."""
+    sprite, mask, baseline_row = rendered
+    top = origin[1] - baseline_row
+    left = origin[0] - 2
+    region = frame[top:top + sprite.shape[0], left:left + sprite.shape[1]]
+    if top >= 0 and region.shape == sprite.shape:
+        np.copyto(region, sprite, where=mask)
+
+
+def _probe_camera(index: int, backend: Optional[int] = None) -> Optional[Tuple[int, int]]:
+    """Open a camera, read one frame and return its (width, height), or None."""
+    cap = cv2.VideoCapture(index) if backend is None else cv2.VideoCapture(index, backend)
+    try:
+        if cap.isOpened():
+            ret, frame = cap.read()
+            if ret and frame is not None:
+                return int(cap.get(cv2.CAP_PROP_FRAME_WIDTH)), int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT))
+        return None
+    finally:
+        cap.release()
+
+
 def list_available_cameras() -> List[Dict]:
     """List all available cameras on the system."""
     logger.info("Scanning for available cameras...")
     available_cameras = []
     
-    for i in range(3):  # Check first 3 camera indices
-        cap = cv2.VideoCapture(i)
-        if cap.isOpened():
-            ret, frame = cap.read()
-            if ret and frame is not None:
-                width = int(cap.get(cv2.CAP_PROP_FRAME_WIDTH))
-                height = int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT))
-                available_cameras.append({
-                    'index': i,
-                    'resolution': f"{width}x{height}",
-                    'backend': 'default'
-                })
-                logger.info(f"Camera {i}: {width}x{height}")
-            cap.release()
-    
-    # Try with AVFoundation backend (macOS specific)
+    # Opening a camera mostly waits on the OS camera stack, so different
+    # indices are probed at once. The backends for one index are tried in
+    # turn, since on macOS they open the same device and would find it busy.
+    # Check first 3 camera indices, then again with AVFoundation (macOS specific)
+    def probe_index(i):
+        return _probe_camera(i, None), _probe_camera(i, cv2.CAP_AVFOUNDATION)
+    
+    with ThreadPoolExecutor(max_workers=3) as executor:
+        results = list(executor.map(probe_index, range(3)))
+    
+    for i, (size, _) in enumerate(results):
+        if size:
+            width, height = size
+            available_cameras.append({
+                'index': i,
+                'resolution': f"{width}x{height}",
+                'backend': 'default'
+            })
+            logger.info(f"Camera {i}: {width}x{height}")
+    
     logger.info("Trying with AVFoundation backend...")
-    for i in range(3):
-        cap = cv2.VideoCapture(i, cv2.CAP_AVFOUNDATION)
-        if cap.isOpened():
-            ret, frame = cap.read()
-            if ret and frame is not None:
-                width = int(cap.get(cv2.CAP_PROP_FRAME_WIDTH))
-                height = int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT))
-                logger.info(f"Camera {i} (AVFoundation): {width}x{height}")
-            cap.release()
+    for i, (_, size) in enumerate(results):
+        if size:
+            width, height = size
+            logger.info(f"Camera {i} (AVFoundation): {width}x{height}")
     
     return available_cameras
@@ -7,12 +7,16 @@ import serial
 import time
 import sys
 
+from arduino_control import wait_for_ready
+
 def test_motor_connections(port='/dev/ttyACM1'):
     """Test motor connections step by step"""
     try:
         print(f"Connecting to Arduino on {port}...")
-        ser = serial.Serial(port=port, baudrate=9600, timeout=2)
-        time.sleep(2)
+        ser = serial.Serial(port=port, baudrate=115200, timeout=0.5)
+        # Wait for the sketch to print READY after its reset (at most 2s)
+        wait_for_ready(ser)
+        ser.timeout = 2
         
         print("✓ Arduino connected!")
         print("\nTesting motor connections...")
@@ -20,8 +24,13 @@ def test_motor_connections(port='/dev/ttyACM1'):
         # Test 1: Check if Arduino responds
         print("\n1. Testing Arduino communication...")
         ser.write(b'h\n')
-        time.sleep(1)
-        response = ser.readline().decode().strip()
+        # readline() blocks until a line arrives (or the 2s timeout), so there's
+        # no need to sleep first; skip the blank lines the help text starts with
+        response = ''
+        for raw in iter(ser.readline, b''):
+            response = raw.decode().strip()
+            if response:
+                break
         if response:
             print(f"✓ Arduino responds: {response}")
         else:
@@ -29,13 +38,12 @@ def test_motor_connections(port='/dev/ttyACM1'):
             return False
         
         # Test 2: Try slowest speed preset
-        print("\n2. Testing with slowest speed (preset 1)...")
-        ser.write(b'1\n')  # Set to 300 steps/sec
-        time.sleep(0.5)
-        
         # Test 3: Try forward movement
+        # The sketch handles commands in order, so the preset and the move go
+        # out together instead of waiting for the preset to "settle" first
+        print("\n2. Testing with slowest speed (preset 1)...")
         print("3. Testing forward movement...")
-        ser.write(b'w\n')
+        ser.write(b'1\nw\n')  # Set to 300 steps/sec, then forward
         time.sleep(2)
         
         # Test 4: Stop
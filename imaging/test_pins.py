@@ -6,12 +6,16 @@ Test individual Arduino pins to verify motor connections
 import serial
 import time
 
+from arduino_control import wait_for_ready
+
 def test_arduino_pins(port='/dev/ttyACM1'):
     """Test individual Arduino pins to verify motor connections"""
     try:
         print(f"Connecting to Arduino on {port}...")
-        ser = serial.Serial(port=port, baudrate=9600, timeout=2)
-        time.sleep(2)
+        ser = serial.Serial(port=port, baudrate=115200, timeout=0.5)
+        # Wait for the sketch to print READY after its reset (at most 2s)
+        wait_for_ready(ser)
+        ser.timeout = 2
         
         print("✓ Arduino connected!")
         print("\nTesting individual pins...")
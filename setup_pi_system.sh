@@ -32,6 +32,12 @@ sudo apt install -y libavcodec-dev libavformat-dev libswscale-dev libv4l-dev
 sudo apt install -y libxvidcore-dev libx264-dev
 sudo apt install -y cmake
 
+# GStreamer (hardware JPEG camera decode) and TBB (multi-threaded OpenCV).
+# Stock OpenCV builds for the Pi lack NEON/VFPV3/TBB; for best performance
+# install an OpenCV .deb built with them. optimized_pi_trash_detection.py logs
+# which of these features the OpenCV it loads was built with
+sudo apt install -y gstreamer1.0-tools gstreamer1.0-plugins-good libtbb-dev
+
 # Set up camera permissions
 echo "Setting up camera permissions..."
 sudo usermod -a -G video pi